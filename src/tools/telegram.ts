@@ -206,6 +206,7 @@ function renderDigestCall(args: any, theme: any): Text {
   if (args.chats?.length) text += theme.fg("dim", ` (${args.chats.join(", ")})`);
   if (args.includeRead) text += theme.fg("dim", " +read");
   if (args.dryRun) text += theme.fg("warning", " [dry run]");
+  if (args.summaryOnly) text += theme.fg("dim", " +summary-only");
   return new Text(text, 0, 0);
 }
 
@@ -216,7 +217,9 @@ function renderDigestResult(result: any, { expanded }: any, theme: any): Text {
   const chats = details?.chats || [];
   const total = details?.totalNewMessages || 0;
 
-  if (total === 0) {
+  const backlogs = chats.filter((c: any) => c.skipped);
+
+  if (total === 0 && backlogs.length === 0) {
     return new Text(theme.fg("dim", "✓ No new messages since last digest"), 0, 0);
   }
 
@@ -231,6 +234,10 @@ function renderDigestResult(result: any, { expanded }: any, theme: any): Text {
       text += "\n  " + theme.fg("error", `✗ ${c.chat?.name}: ${c.error}`);
       continue;
     }
+    if (c.skipped) {
+      text += "\n  " + theme.fg("warning", `↷ ${c.chat?.name}: ${c.unreadCount} unread skipped`);
+      continue;
+    }
     if (c.newCount === 0) continue;
 
     text += "\n  " + theme.fg("accent", c.chat?.name || "?") + theme.fg("dim", ` (${c.newCount} messages)`);
@@ -312,13 +319,14 @@ async function telegramContacts(args: { search?: string }) {
   return runTelegramScript(execFn!, "contacts.py", scriptArgs);
 }
 
-async function telegramDigest(args: { chats?: string[]; limit?: number; maxTotal?: number; includeRead?: boolean; dryRun?: boolean }) {
+async function telegramDigest(args: { chats?: string[]; limit?: number; maxTotal?: number; includeRead?: boolean; dryRun?: boolean; summaryOnly?: boolean }) {
   if (!telegramSessionExists()) throw new TelegramNotConnectedError();
   const scriptArgs: string[] = [];
   if (args.limit) scriptArgs.push("--limit", String(args.limit));
   if (args.maxTotal) scriptArgs.push("--max-total", String(args.maxTotal));
   if (args.includeRead) scriptArgs.push("--include-read");
   if (args.dryRun) scriptArgs.push("--dry-run");
+  if (args.summaryOnly) scriptArgs.push("--summary-only");
   if (args.chats?.length) scriptArgs.push("--chats", args.chats.join(","));
   return runTelegramScript(execFn!, "digest.py", scriptArgs, { timeout: 120000 });
 }
@@ -643,6 +651,7 @@ export function registerTelegramTools(pi: ExtensionAPI) {
       maxTotal: Type.Optional(Type.Number({ description: "Max total messages across all chats (default: 200). Prevents context overflow." })),
       includeRead: Type.Optional(Type.Boolean({ description: "Also check previously-digested chats even if 0 unread in Telegram" })),
       dryRun: Type.Optional(Type.Boolean({ description: "Fetch but don't update watermarks (preview mode)" })),
+      summaryOnly: Type.Optional(Type.Boolean({ description: "Skip never-digested chats with a huge unread backlog (reports the count and advances the watermark instead of fetching)" })),
     }),
     renderCall: renderDigestCall,
     renderResult: renderDigestResult,
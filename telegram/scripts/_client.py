@@ -6,13 +6,30 @@ Session is stored at ~/.config/seed-network/telegram/session.json
 containing: { apiId, apiHash, phone, sessionString, authenticatedAt }
 """
 
-import json
+import asyncio
 import sys
 import os
+import re
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from functools import cache
 from pathlib import Path
-from typing import NoReturn
-from telethon import TelegramClient
-from telethon.sessions import StringSession
+from typing import TYPE_CHECKING, NoReturn
+import orjson
+from _files import write_json_atomic
+
+# Importing any part of telethon loads its whole client stack (~250 ms), so it
+# is deferred until a function actually needs it. This keeps --help and
+# argument errors instant for every script.
+if TYPE_CHECKING:
+    from telethon import TelegramClient
+
+
+@cache
+def _tl_types():
+    """telethon.tl.types, imported on first use."""
+    from telethon.tl import types
+    return types
 
 SESSION_DIR = Path.home() / ".config" / "seed-network" / "telegram"
 SESSION_PATH = SESSION_DIR / "session.json"
@@ -27,30 +44,31 @@ def load_session() -> dict:
     if not SESSION_PATH.exists():
         error("Not connected to Telegram. Run /telegram-login or: uv run scripts/login.py", "NOT_CONNECTED")
     try:
-        data = json.loads(SESSION_PATH.read_text())
+        data = orjson.loads(SESSION_PATH.read_bytes())
         if not data.get("sessionString") or not data.get("apiId") or not data.get("apiHash"):
             error("Invalid session file. Re-run /telegram-login", "INVALID_SESSION")
         return data
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         error("Corrupt session file. Re-run /telegram-login", "INVALID_SESSION")
 
 
 def save_session(api_id: int, api_hash: str, phone: str, session_string: str):
-    """Save session to disk."""
-    SESSION_DIR.mkdir(parents=True, exist_ok=True)
+    """Save session to disk (atomically, mode 0600)."""
     data = {
         "apiId": api_id,
         "apiHash": api_hash,
         "phone": phone,
         "sessionString": session_string,
-        "authenticatedAt": __import__("datetime").datetime.now().isoformat(),
+        "authenticatedAt": datetime.now().isoformat(),
     }
-    SESSION_PATH.write_text(json.dumps(data, indent=2))
-    SESSION_PATH.chmod(0o600)
+    write_json_atomic(SESSION_PATH, data)
 
 
-def get_client() -> TelegramClient:
+def get_client() -> "TelegramClient":
     """Create a TelegramClient from stored session. Not yet connected."""
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+
     data = load_session()
     client = TelegramClient(
         StringSession(data["sessionString"]),
@@ -60,34 +78,149 @@ def get_client() -> TelegramClient:
     return client
 
 
+@asynccontextmanager
+async def telegram_client(client: "TelegramClient | None" = None):
+    """
+    Connect a client (the stored session by default) for the duration of the
+    block and always disconnect it afterwards, including when error()/output()
+    exit from inside. Exits with CONNECTION_ERROR if connecting fails.
+    """
+    if client is None:
+        client = get_client()
+    try:
+        await client.connect()
+    except Exception as e:
+        error(f"Failed to connect: {e}", "CONNECTION_ERROR")
+    try:
+        yield client
+    finally:
+        await client.disconnect()
+
+
+def run(coro):
+    """Run a script's entry coroutine, on uvloop where it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
 # =============================================================================
 # Output Helpers
 # =============================================================================
 
+def _dumps(data) -> bytes:
+    """Serialize to compact UTF-8 JSON (datetimes as ISO 8601). Unknown types fall back to str()."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _write_line(payload: bytes):
+    """Write one JSON line straight to the stdout byte stream."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload + b"\n")
+    sys.stdout.buffer.flush()
+
+
 def output(data):
     """Print JSON to stdout and exit cleanly."""
-    print(json.dumps(data, default=str, ensure_ascii=False))
+    _write_line(_dumps(data))
+    sys.exit(0)
+
+
+def output_items(key: str, items, extra: dict | None = None):
+    """
+    Stream {key: [...items], "count": n, **extra} to stdout and exit cleanly.
+
+    Items are encoded and written one at a time, so a large result never
+    exists as a full list of dicts plus one big JSON string. The output is
+    still a single JSON line. items must not need the network to produce:
+    once the first byte is written, the payload cannot turn into an error.
+    """
+    sys.stdout.flush()
+    write = sys.stdout.buffer.write
+    write(b"{" + _dumps(key) + b":[")
+    count = 0
+    for item in items:
+        if count:
+            write(b",")
+        write(_dumps(item))
+        count += 1
+    write(b"]," + _dumps({"count": count, **(extra or {})})[1:] + b"\n")
+    sys.stdout.buffer.flush()
     sys.exit(0)
 
 
 def error(msg: str, code: str = "ERROR") -> NoReturn:
     """Print error JSON to stdout and exit with code 1."""
-    print(json.dumps({"error": msg, "code": code}))
+    _write_line(_dumps({"error": msg, "code": code}))
     sys.exit(1)
 
 
+# =============================================================================
+# Retry
+# =============================================================================
+
+# Transient failures worth retrying with backoff. RPC errors are not: they
+# are the server's answer and would come back the same.
+_TRANSIENT_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+
+async def call_with_retry(factory, max_wait: int = 60, max_retries: int = 3):
+    """
+    Await factory() and retry on flood waits and transient network errors.
+
+    factory must build a fresh coroutine per call (e.g. a lambda). Flood
+    waits sleep for the server-provided duration when it is at most
+    max_wait seconds; longer waits are re-raised so the caller can report
+    FLOOD_WAIT. Network errors back off 1s, 2s, 4s, ... Only wrap reads:
+    a write that failed mid-flight may already have been applied.
+    """
+    from telethon.errors import FloodWaitError
+
+    attempt = 0
+    while True:
+        try:
+            return await factory()
+        except FloodWaitError as e:
+            if e.seconds > max_wait or attempt >= max_retries:
+                raise
+            await asyncio.sleep(e.seconds + 1)
+        except _TRANSIENT_ERRORS:
+            if attempt >= max_retries:
+                raise
+            await asyncio.sleep(2 ** attempt)
+        attempt += 1
+
+
 # =============================================================================
 # Chat Resolution
 # =============================================================================
 
+# Chat args that resolve_chat's numeric or @username lookups handle before
+# the dialog scan (Telegram usernames: 5-32 chars, letter first).
+_USERNAME_OR_ID = re.compile(r"-?\d+|@?[A-Za-z][A-Za-z0-9_]{4,31}")
+
+
 async def resolve_chat(client, chat_arg: str):
     """
     Resolve a chat argument to a Telethon entity.
     Accepts: numeric ID, @username, or chat name (fuzzy matched).
     Returns the entity or None.
     """
+    from _resolve_cache import get_cached_peer, cache_peers, forget_peer
+
+    # Names resolved by the fuzzy dialog scan on a previous run
+    cached = get_cached_peer(chat_arg)
+    if cached is not None:
+        try:
+            return await client.get_entity(cached)
+        except Exception:
+            forget_peer(chat_arg)
+
     # Try as numeric ID (also try common Telegram ID prefixes for groups/channels)
-    try:
+    if chat_arg.removeprefix("-").isdecimal():
         chat_id = int(chat_arg)
         # Try the ID as-is first
         try:
@@ -101,8 +234,6 @@ async def resolve_chat(client, chat_arg: str):
                     return await client.get_entity(prefixed)
                 except Exception:
                     pass
-    except ValueError:
-        pass
 
     # Try as @username (with or without @ prefix)
     username = chat_arg if chat_arg.startswith("@") else f"@{chat_arg}"
@@ -111,49 +242,91 @@ async def resolve_chat(client, chat_arg: str):
     except Exception:
         pass
 
-    # Fuzzy match against dialogs
+    # Fuzzy match against dialogs in a single pass, streamed so an exact
+    # match stops fetching further pages.
+    # Rank: exact (name or username) > starts with > contains; ties go to dialog order.
     try:
-        dialogs = await client.get_dialogs(limit=200)
+        dialogs = []
         chat_lower = chat_arg.lower()
 
-        # Exact match on name or username first
-        for d in dialogs:
-            entity_username = getattr(d.entity, "username", None)
-            if d.name and d.name.lower() == chat_lower:
-                return d.entity
-            if entity_username and entity_username.lower() == chat_lower:
-                return d.entity
-        # Starts with (name or username)
-        for d in dialogs:
-            entity_username = getattr(d.entity, "username", None)
-            if d.name and d.name.lower().startswith(chat_lower):
-                return d.entity
-            if entity_username and entity_username.lower().startswith(chat_lower):
-                return d.entity
-        # Contains (name or username)
-        for d in dialogs:
+        best, best_rank = None, 3
+        async for d in client.iter_dialogs(limit=200):
+            dialogs.append(d)
+            name = d.name.lower() if d.name else ""
             entity_username = getattr(d.entity, "username", None)
-            if d.name and chat_lower in d.name.lower():
-                return d.entity
-            if entity_username and chat_lower in entity_username.lower():
-                return d.entity
+            username = entity_username.lower() if entity_username else ""
+            if (name and name == chat_lower) or (username and username == chat_lower):
+                best, best_rank = d.entity, 0
+                break
+            if best_rank > 1 and ((name and name.startswith(chat_lower)) or (username and username.startswith(chat_lower))):
+                best, best_rank = d.entity, 1
+            elif best_rank > 2 and ((name and chat_lower in name) or (username and chat_lower in username)):
+                best, best_rank = d.entity, 2
+
+        # Seed the cache with this result and every exact dialog name seen, so
+        # later lookups of other chats skip the scan too. Names the
+        # numeric/@username paths would claim first are left out so the
+        # cache never shadows them.
+        resolved = [(chat_arg, best)] if best is not None else []
+        resolved.extend(
+            (d.name, d.entity) for d in dialogs
+            if d.name and not _USERNAME_OR_ID.fullmatch(d.name)
+        )
+        try:
+            cache_peers(resolved)
+        except Exception:
+            pass  # caching is best-effort
+        if best is not None:
+            return best
     except Exception:
         pass
 
     return None
 
 
+async def resolve_from_user(client, user_arg: str):
+    """
+    Resolve a --from-user argument (@username or numeric user ID).
+    Returns the entity (or its cached InputPeer) or None.
+    """
+    from _resolve_cache import get_cached_peer, cache_peer
+
+    # A username resolved on a previous run is rebuilt from the cache,
+    # skipping the ResolveUsername round-trip
+    username = user_arg if user_arg.startswith("@") else f"@{user_arg}"
+    cached = get_cached_peer(username)
+    if cached is not None:
+        return cached
+    try:
+        entity = await client.get_entity(username)
+    except Exception:
+        pass
+    else:
+        try:
+            cache_peer(username, entity)
+        except Exception:
+            pass  # caching is best-effort
+        return entity
+    try:
+        return await client.get_entity(int(user_arg))
+    except Exception:
+        return None
+
+
+@cache
+def _entity_classifiers() -> dict:
+    tl = _tl_types()
+    return {
+        tl.User: lambda e: "bot" if e.bot else "user",
+        tl.Chat: lambda e: "group",
+        tl.Channel: lambda e: "channel" if e.broadcast else "supergroup",
+    }
+
+
 def classify_entity(entity) -> str:
     """Classify a Telethon entity into a chat type string."""
-    from telethon.tl.types import User, Chat, Channel
-
-    if isinstance(entity, User):
-        return "bot" if entity.bot else "user"
-    elif isinstance(entity, Chat):
-        return "group"
-    elif isinstance(entity, Channel):
-        return "channel" if entity.broadcast else "supergroup"
-    return "unknown"
+    classify = _entity_classifiers().get(entity.__class__)
+    return classify(entity) if classify else "unknown"
 
 
 # =============================================================================
@@ -162,16 +335,21 @@ def classify_entity(entity) -> str:
 
 def parse_date(date_str: str):
     """Parse an ISO 8601 or YYYY-MM-DD date string to a timezone-aware datetime."""
-    from datetime import datetime, timezone
+    # YYYY-MM-DD is the common CLI form: build it directly
+    if len(date_str) == 10:
+        d = date.fromisoformat(date_str)
+        return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
     try:
-        return datetime.fromisoformat(date_str).replace(tzinfo=timezone.utc)
+        dt = datetime.fromisoformat(date_str)
     except ValueError:
+        # Unpadded dates like 2026-2-1
         return datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    # Naive timestamps are taken as UTC; an explicit offset is kept
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 def parse_date_end_of_day(date_str: str):
     """Parse a date string, setting time to end of day for date-only inputs."""
-    from datetime import datetime, timezone
     dt = parse_date(date_str)
     # If only a date was given (no time component), set to end of day
     if "T" not in date_str and " " not in date_str:
@@ -183,23 +361,35 @@ def parse_date_end_of_day(date_str: str):
 # Formatters
 # =============================================================================
 
+def full_name(first: str | None, last: str | None) -> str:
+    """Join first and last name, skipping empty parts ("" if both are empty)."""
+    if first and last:
+        return f"{first} {last}"
+    return first or last or ""
+
+
+def entity_name(entity) -> str:
+    """Display name of a chat entity: the group/channel title or the user's first name."""
+    # Plain dict lookups: Telethon entities keep their fields in __dict__
+    attrs = vars(entity)
+    return attrs.get("title") or attrs.get("first_name") or "Unknown"
+
+
 def format_sender(sender) -> dict:
     """Format a Telethon User/Channel entity into a clean dict."""
     if sender is None:
         return {"id": None, "name": "Unknown", "username": None}
 
-    from telethon.tl.types import User, Channel, Chat
-
-    if isinstance(sender, User):
-        name_parts = [sender.first_name or "", sender.last_name or ""]
-        name = " ".join(p for p in name_parts if p) or "Unknown"
+    tl = _tl_types()
+    if isinstance(sender, tl.User):
+        name = full_name(sender.first_name, sender.last_name) or "Unknown"
         return {
             "id": str(sender.id),
             "name": name,
             "username": sender.username,
             "isBot": sender.bot or False,
         }
-    elif isinstance(sender, (Channel, Chat)):
+    elif isinstance(sender, (tl.Channel, tl.Chat)):
         return {
             "id": str(sender.id),
             "name": sender.title or "Unknown",
@@ -210,54 +400,108 @@ def format_sender(sender) -> dict:
         return {"id": str(getattr(sender, "id", None)), "name": str(sender), "username": None}
 
 
-def format_message(msg) -> dict:
-    """Format a Telethon Message into a clean dict."""
+def _format_sender_cached(sender, cache: dict | None) -> dict:
+    """format_sender, memoized per (type, id) in the caller's cache."""
+    if cache is None or sender is None:
+        return format_sender(sender)
+    key = (type(sender), getattr(sender, "id", None))
+    formatted = cache.get(key)
+    if formatted is None:
+        formatted = cache[key] = format_sender(sender)
+    return formatted
+
+
+@cache
+def _media_types() -> dict:
+    """Message media classes and their type; documents are refined by their attributes."""
+    tl = _tl_types()
+    return {
+        tl.MessageMediaPhoto: "photo",
+        tl.MessageMediaDocument: "document",
+        tl.MessageMediaWebPage: "webpage",
+    }
+
+
+@cache
+def _document_attr_types() -> dict:
+    """Document attributes that map straight to a media type (audio needs the voice flag)."""
+    tl = _tl_types()
+    return {
+        tl.DocumentAttributeVideo: "video",
+        tl.DocumentAttributeSticker: "sticker",
+    }
+
+
+def _document_media_type(doc) -> str | None:
+    """Media type of a document from its attributes (None for a missing document)."""
+    if not doc:
+        return None
+    attr_types = _document_attr_types()
+    audio = _tl_types().DocumentAttributeAudio
+    for attr in doc.attributes:
+        kind = attr_types.get(type(attr))
+        if kind:
+            return kind
+        if isinstance(attr, audio):
+            return "voice" if attr.voice else "audio"
+    return "document"
+
+
+_MISSING = object()
+
+
+def format_message(msg, sender_cache: dict | None = None) -> dict:
+    """
+    Format a Telethon Message into a clean dict.
+    Pass a shared sender_cache when formatting a batch so each distinct
+    sender is only formatted once.
+    """
     media_type = None
-    if msg.media:
-        from telethon.tl.types import (
-            MessageMediaPhoto,
-            MessageMediaDocument,
-            MessageMediaWebPage,
-        )
-        if isinstance(msg.media, MessageMediaPhoto):
-            media_type = "photo"
-        elif isinstance(msg.media, MessageMediaDocument):
-            doc = msg.media.document
-            if doc:
-                for attr in doc.attributes:
-                    attr_name = type(attr).__name__
-                    if attr_name == "DocumentAttributeVideo":
-                        media_type = "video"
-                        break
-                    elif attr_name == "DocumentAttributeAudio":
-                        media_type = "voice" if getattr(attr, "voice", False) else "audio"
-                        break
-                    elif attr_name == "DocumentAttributeSticker":
-                        media_type = "sticker"
-                        break
-                if not media_type:
-                    media_type = "document"
-        elif isinstance(msg.media, MessageMediaWebPage):
-            media_type = "webpage"
-
-    reactions = []
-    if msg.reactions and msg.reactions.results:
-        for r in msg.reactions.results:
-            emoji = getattr(r.reaction, "emoticon", None) or str(r.reaction)
-            reactions.append({"emoji": emoji, "count": r.count})
+    media = msg.media
+    if media:
+        media_type = _media_types().get(media.__class__)
+        if media_type == "document":
+            media_type = _document_media_type(media.document)
+
+    results = msg.reactions.results if msg.reactions else None
+    reactions = [
+        {"emoji": getattr(r.reaction, "emoticon", None) or str(r.reaction), "count": r.count}
+        for r in results
+    ] if results else None
+
+    # Forwarded from a channel/group: its title; from a user: the sender dict
+    forward_from = None
+    fwd = msg.forward
+    if fwd:
+        fwd_chat = getattr(fwd, "chat", None)
+        if fwd_chat:
+            forward_from = fwd_chat.title
+        else:
+            fwd_sender = getattr(fwd, "sender", _MISSING)
+            if fwd_sender is not _MISSING:
+                forward_from = _format_sender_cached(fwd_sender, sender_cache)
 
     return {
         "id": str(msg.id),
         "date": msg.date.isoformat() if msg.date else None,
-        "sender": format_sender(msg.sender),
+        "sender": _format_sender_cached(msg.sender, sender_cache),
         "text": msg.text or None,
         "replyTo": str(msg.reply_to.reply_to_msg_id) if msg.reply_to else None,
-        "forwardFrom": msg.forward.chat.title if msg.forward and hasattr(msg.forward, "chat") and msg.forward.chat else (
-            format_sender(msg.forward.sender) if msg.forward and hasattr(msg.forward, "sender") else None
-        ),
+        "forwardFrom": forward_from,
         "mediaType": media_type,
         "views": msg.views,
-        "reactions": reactions if reactions else None,
+        "reactions": reactions,
         "isPinned": msg.pinned or False,
         "editDate": msg.edit_date.isoformat() if msg.edit_date else None,
     }
+
+
+def format_messages(msgs) -> list[dict]:
+    """
+    Format an iterable of Telethon Messages, preserving order.
+    Senders are formatted once per batch; messages from the same sender
+    share the same sender dict.
+    """
+    fmt = format_message
+    senders = {}
+    return [fmt(msg, senders) for msg in msgs]
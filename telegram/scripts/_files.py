@@ -0,0 +1,48 @@
+"""
+Crash-safe JSON file writes for the local state files
+(session.json, pending.json, watermarks.json, resolve_cache.json).
+
+Data is written to a unique sibling temp file and renamed over the target, so a
+crash mid-write leaves the previous file intact instead of a truncated one.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import orjson
+
+
+def write_json_atomic(path: Path, data, mode: int = 0o600):
+    """Serialize data as indented JSON and atomically replace path with it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp file per write, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with open(fd, "wb", buffering=65536) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Hold an exclusive advisory lock on path + ".lock" for the block.
+
+    Wrap read-modify-write cycles so concurrent runs don't overwrite each
+    other's updates. A no-op where fcntl is unavailable (Windows).
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        yield
@@ -0,0 +1,110 @@
+"""
+Cache of fuzzy chat-name resolutions for resolve_chat.
+
+Stores { chatArgLower: { peerType, id, accessHash, cachedAt } } in a local
+JSON file. A hit rebuilds the InputPeer directly, so repeat lookups of the
+same name skip the 200-dialog fetch. StringSession keeps no entity cache
+between runs, which is why the access hash is stored alongside the ID.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import orjson
+
+from _files import write_json_atomic
+
+RESOLVE_CACHE_PATH = Path.home() / ".config" / "seed-network" / "telegram" / "resolve_cache.json"
+RESOLVE_CACHE_TTL = timedelta(hours=24)
+
+
+def load_resolve_cache() -> dict:
+    """Load the cache from disk. Returns empty dict if missing or corrupt."""
+    if not RESOLVE_CACHE_PATH.exists():
+        return {}
+    try:
+        return orjson.loads(RESOLVE_CACHE_PATH.read_bytes())
+    except (orjson.JSONDecodeError, OSError):
+        return {}
+
+
+def save_resolve_cache(cache: dict):
+    """Save the cache to disk."""
+    write_json_atomic(RESOLVE_CACHE_PATH, cache)
+
+
+def get_cached_peer(chat_arg: str):
+    """Return the cached InputPeer for chat_arg, or None if missing/expired."""
+    entry = load_resolve_cache().get(chat_arg.lower())
+    if not entry or not isinstance(entry, dict):
+        return None
+    try:
+        cached_at = datetime.fromisoformat(entry["cachedAt"])
+        if datetime.now(timezone.utc) - cached_at > RESOLVE_CACHE_TTL:
+            return None
+        peer_type, peer_id, access_hash = entry["peerType"], int(entry["id"]), entry.get("accessHash")
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    from telethon.tl.types import InputPeerUser, InputPeerChat, InputPeerChannel
+
+    if peer_type == "user":
+        return InputPeerUser(peer_id, int(access_hash or 0))
+    if peer_type == "channel":
+        return InputPeerChannel(peer_id, int(access_hash or 0))
+    if peer_type == "chat":
+        return InputPeerChat(peer_id)
+    return None
+
+
+def _entry(entity, cached_at: str) -> dict | None:
+    from telethon.tl.types import User, Chat, Channel
+
+    if isinstance(entity, User):
+        peer_type = "user"
+    elif isinstance(entity, Channel):
+        peer_type = "channel"
+    elif isinstance(entity, Chat):
+        peer_type = "chat"
+    else:
+        return None
+    return {
+        "peerType": peer_type,
+        "id": entity.id,
+        "accessHash": getattr(entity, "access_hash", None),
+        "cachedAt": cached_at,
+    }
+
+
+def cache_peer(chat_arg: str, entity):
+    """Remember which entity chat_arg resolved to."""
+    cache_peers([(chat_arg, entity)])
+
+
+def cache_peers(pairs):
+    """Remember several (chat_arg, entity) resolutions with a single write.
+
+    The first entity seen for a name wins, matching dialog order.
+    """
+    cached_at = datetime.now(timezone.utc).isoformat()
+    cache = load_resolve_cache()
+    seen = set()
+    changed = False
+    for chat_arg, entity in pairs:
+        key = chat_arg.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        entry = _entry(entity, cached_at)
+        if entry is not None:
+            cache[key] = entry
+            changed = True
+    if changed:
+        save_resolve_cache(cache)
+
+
+def forget_peer(chat_arg: str):
+    """Drop a stale entry (e.g. the chat was left or deleted)."""
+    cache = load_resolve_cache()
+    if cache.pop(chat_arg.lower(), None) is not None:
+        save_resolve_cache(cache)
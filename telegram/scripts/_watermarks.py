@@ -6,32 +6,71 @@ This tracks what the *agent* has processed, independent of Telegram's
 unread counts (which clear when you open the app).
 """
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
+from _files import file_lock, write_json_atomic
+
 WATERMARKS_PATH = Path.home() / ".config" / "seed-network" / "telegram" / "watermarks.json"
 
+# In-process copy of the watermarks file, keyed by the path and stat of the
+# file it was read from. Repeat loads cost one stat() instead of a re-parse,
+# and a write by another run (a new inode, mtime or size) is picked up.
+_CACHE: dict | None = None
+_CACHE_KEY: tuple | None = None
 
-def load_watermarks() -> dict:
-    """Load watermarks from disk. Returns empty dict if file doesn't exist."""
+
+def _file_key() -> tuple:
+    try:
+        st = WATERMARKS_PATH.stat()
+    except OSError:
+        return (WATERMARKS_PATH, None)
+    return (WATERMARKS_PATH, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_watermarks() -> dict:
     if not WATERMARKS_PATH.exists():
         return {}
     try:
-        return json.loads(WATERMARKS_PATH.read_text())
-    except (json.JSONDecodeError, OSError):
+        return orjson.loads(WATERMARKS_PATH.read_bytes())
+    except (orjson.JSONDecodeError, OSError):
         return {}
 
 
+def _cached_watermarks() -> dict:
+    """The cached dict itself — read-only for callers in this module."""
+    global _CACHE, _CACHE_KEY
+    key = _file_key()
+    if _CACHE is None or _CACHE_KEY != key:
+        _CACHE = _read_watermarks()
+        _CACHE_KEY = key
+    return _CACHE
+
+
+def _copy_watermarks(watermarks: dict) -> dict:
+    """Copy down to the per-chat entries, so no dict is shared with the cache."""
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in watermarks.items()}
+
+
+def load_watermarks() -> dict:
+    """Load watermarks (cached until the file changes). Returns empty dict if file doesn't exist."""
+    # A copy, so callers mutating the result can't corrupt the cache
+    return _copy_watermarks(_cached_watermarks())
+
+
 def save_watermarks(watermarks: dict):
-    """Save watermarks to disk."""
-    WATERMARKS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    WATERMARKS_PATH.write_text(json.dumps(watermarks, indent=2))
+    """Save watermarks to disk (atomically) and refresh the in-process cache."""
+    global _CACHE, _CACHE_KEY
+    write_json_atomic(WATERMARKS_PATH, watermarks)
+    _CACHE = _copy_watermarks(watermarks)
+    _CACHE_KEY = _file_key()
 
 
 def get_watermark(chat_id: str) -> int | None:
     """Get the last seen message ID for a chat. Returns None if never seen."""
-    wm = load_watermarks()
+    wm = _cached_watermarks()
     entry = wm.get(str(chat_id))
     if entry and isinstance(entry, dict):
         return entry.get("lastMessageId")
@@ -40,29 +79,32 @@ def get_watermark(chat_id: str) -> int | None:
 
 def set_watermark(chat_id: str, message_id: int, chat_name: str | None = None):
     """Update the watermark for a chat."""
-    wm = load_watermarks()
-    wm[str(chat_id)] = {
-        "lastMessageId": message_id,
-        "lastRunAt": datetime.now(timezone.utc).isoformat(),
-        "chatName": chat_name,
-    }
-    save_watermarks(wm)
+    set_watermarks_batch([{"chatId": chat_id, "messageId": message_id, "chatName": chat_name}])
 
 
 def set_watermarks_batch(updates: list[dict]):
-    """Update multiple watermarks at once. Each dict: { chatId, messageId, chatName? }"""
-    wm = load_watermarks()
+    """
+    Update multiple watermarks at once. Each dict: { chatId, messageId, chatName? }
+
+    The file is re-read under a lock and written once, so a concurrent run's
+    updates to other chats are merged rather than overwritten.
+    """
     now = datetime.now(timezone.utc).isoformat()
-    for u in updates:
-        wm[str(u["chatId"])] = {
-            "lastMessageId": u["messageId"],
-            "lastRunAt": now,
-            "chatName": u.get("chatName"),
-        }
-    save_watermarks(wm)
+    with file_lock(WATERMARKS_PATH):
+        wm = _read_watermarks()
+        for u in updates:
+            wm[str(u["chatId"])] = {
+                "lastMessageId": u["messageId"],
+                "lastRunAt": now,
+                "chatName": u.get("chatName"),
+            }
+        save_watermarks(wm)
 
 
 def clear_watermarks():
     """Delete all watermarks (next digest will process everything)."""
+    global _CACHE, _CACHE_KEY
     if WATERMARKS_PATH.exists():
         WATERMARKS_PATH.unlink()
+    _CACHE = None
+    _CACHE_KEY = None
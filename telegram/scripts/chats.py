@@ -7,19 +7,44 @@ Usage:
 """
 
 import argparse
-import asyncio
-import json
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_sender, format_message, classify_entity
+from _client import get_client, output, output_items, error, classify_entity, run
 
-from telethon.tl.types import Chat, Channel
-from telethon.errors import FloodWaitError
+
+def format_dialog(d, dtype: str) -> dict:
+    """Format a Telethon Dialog into the chat dict returned by list_chats."""
+    from telethon.tl.types import Chat, Channel
+
+    entity = d.entity
+    last_msg = None
+    if d.message:
+        last_msg = {
+            "date": d.message.date,
+            "sender": d.message.sender.first_name if hasattr(d.message, "sender") and d.message.sender and hasattr(d.message.sender, "first_name") else None,
+            "text": (d.message.text or "")[:200] if d.message.text else None,
+        }
+
+    chat = {
+        "id": str(entity.id),
+        "name": d.name or "Unknown",
+        "type": dtype,
+        "unreadCount": d.unread_count,
+        "lastMessage": last_msg,
+        "username": getattr(entity, "username", None),
+    }
+
+    if isinstance(entity, (Chat, Channel)):
+        chat["memberCount"] = getattr(entity, "participants_count", None)
+
+    return chat
 
 
 async def list_chats(limit: int = 50, chat_type: str = "all", archived: bool = False):
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -27,50 +52,28 @@ async def list_chats(limit: int = 50, chat_type: str = "all", archived: bool = F
     except Exception as e:
         error(f"Failed to connect: {e}", "CONNECTION_ERROR")
 
+    # Stream dialogs and stop as soon as enough match, instead of
+    # over-fetching a fixed multiple of limit and discarding the rest.
+    matched = []
     try:
-        dialogs = await client.get_dialogs(
-            limit=limit * 2 if chat_type != "all" else limit,
+        async for d in client.iter_dialogs(
+            limit=limit if chat_type == "all" else None,
             archived=archived,
-        )
+        ):
+            dtype = classify_entity(d.entity)
+            if chat_type != "all" and dtype != chat_type:
+                continue
+
+            matched.append((d, dtype))
+            if len(matched) >= limit:
+                break
     except FloodWaitError as e:
         error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
     except Exception as e:
         error(f"Failed to get dialogs: {e}", "API_ERROR")
 
-    chats = []
-    for d in dialogs:
-        dtype = classify_entity(d.entity)
-        if chat_type != "all" and dtype != chat_type:
-            continue
-
-        entity = d.entity
-        last_msg = None
-        if d.message:
-            last_msg = {
-                "date": d.message.date.isoformat() if d.message.date else None,
-                "sender": d.message.sender.first_name if hasattr(d.message, "sender") and d.message.sender and hasattr(d.message.sender, "first_name") else None,
-                "text": (d.message.text or "")[:200] if d.message.text else None,
-            }
-
-        chat = {
-            "id": str(entity.id),
-            "name": d.name or "Unknown",
-            "type": dtype,
-            "unreadCount": d.unread_count,
-            "lastMessage": last_msg,
-            "username": getattr(entity, "username", None),
-        }
-
-        if isinstance(entity, (Chat, Channel)):
-            chat["memberCount"] = getattr(entity, "participants_count", None)
-
-        chats.append(chat)
-
-        if len(chats) >= limit:
-            break
-
     await client.disconnect()
-    output({"chats": chats, "count": len(chats)})
+    output_items("chats", (format_dialog(d, dtype) for d, dtype in matched))
 
 
 def main():
@@ -84,14 +87,15 @@ def main():
     args = parser.parse_args()
 
     if args.sync:
-        asyncio.run(list_chats_and_sync(args.limit, args.chat_type, args.archived))
+        run(list_chats_and_sync(args.limit, args.chat_type, args.archived))
     else:
-        asyncio.run(list_chats(args.limit, args.chat_type, args.archived))
+        run(list_chats(args.limit, args.chat_type, args.archived))
 
 
 async def list_chats_and_sync(limit: int = 500, chat_type: str = "all", archived: bool = False):
     """Fetch chats from Telegram and push to Seed Network API."""
     from _sync import sync_chats
+    from telethon.errors import FloodWaitError
 
     client = get_client()
     try:
@@ -7,18 +7,17 @@ Usage:
 """
 
 import argparse
-import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_sender
-
-from telethon.errors import FloodWaitError
-from telethon.tl.functions.contacts import GetContactsRequest, SearchRequest
+from _client import get_client, output, error, format_sender, run
 
 
 async def list_contacts(search: str | None = None):
+    from telethon.errors import FloodWaitError
+    from telethon.tl.functions.contacts import GetContactsRequest, SearchRequest
+
     client = get_client()
 
     try:
@@ -51,7 +50,7 @@ def main():
     parser.add_argument("--search", type=str, help="Search by name or username")
     args = parser.parse_args()
 
-    asyncio.run(list_contacts(args.search))
+    run(list_contacts(args.search))
 
 
 if __name__ == "__main__":
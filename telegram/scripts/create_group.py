@@ -14,15 +14,59 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_sender
+from _client import get_client, output, error, format_sender, full_name, run
 
-from telethon.errors import FloodWaitError
-from telethon.tl.functions.messages import CreateChatRequest
-from telethon.tl.functions.contacts import SearchRequest
 
+async def load_contact_index(client) -> dict:
+    """
+    Fetch the contact list once and index it by numeric ID, username and
+    full name (lowercased), so most user args resolve without a round-trip.
+    Returns {"ids": {...}, "usernames": {...}, "names": {...}}.
+    """
+    from telethon.tl.functions.contacts import GetContactsRequest
 
-async def resolve_user(client, user_arg: str):
+    try:
+        result = await client(GetContactsRequest(hash=0))
+    except Exception:
+        return {}
+
+    by_id, by_username, by_name = {}, {}, {}
+    for u in result.users:
+        by_id[str(u.id)] = u
+        if u.username:
+            by_username.setdefault(u.username.lower(), u)
+        name = full_name(u.first_name, u.last_name)
+        if name:
+            by_name.setdefault(name.lower(), u)
+    return {"ids": by_id, "usernames": by_username, "names": by_name}
+
+
+def lookup_contact(contacts: dict, user_arg: str):
+    """
+    Find a user arg in the contact index. @username args only match
+    usernames, so "@alice" never picks a contact merely named "Alice";
+    bare args try ID, then username, then full name.
+    """
+    if user_arg.startswith("@"):
+        return contacts["usernames"].get(user_arg[1:].lower())
+    key = user_arg.lower()
+    return (
+        contacts["ids"].get(user_arg)
+        or contacts["usernames"].get(key)
+        or contacts["names"].get(key)
+    )
+
+
+async def resolve_user(client, user_arg: str, contacts: dict | None = None):
     """Resolve a user argument to a Telethon InputUser entity."""
+    from telethon.tl.functions.contacts import SearchRequest
+
+    # Try the prefetched contact index first (no network)
+    if contacts:
+        hit = lookup_contact(contacts, user_arg)
+        if hit:
+            return hit
+
     # Try as numeric ID
     try:
         user_id = int(user_arg)
@@ -43,9 +87,7 @@ async def resolve_user(client, user_arg: str):
         if result.users:
             # Exact match on name
             for u in result.users:
-                name_parts = [u.first_name or "", u.last_name or ""]
-                full_name = " ".join(p for p in name_parts if p)
-                if full_name.lower() == user_arg.lower():
+                if full_name(u.first_name, u.last_name).lower() == user_arg.lower():
                     return u
             # Exact match on username
             for u in result.users:
@@ -65,6 +107,9 @@ async def create_group(title: str, user_args: list[str], message: str | None = N
     if not title.strip():
         error("Group title cannot be empty", "INVALID_INPUT")
 
+    from telethon.errors import FloodWaitError
+    from telethon.tl.functions.messages import CreateChatRequest
+
     client = get_client()
 
     try:
@@ -72,11 +117,13 @@ async def create_group(title: str, user_args: list[str], message: str | None = N
     except Exception as e:
         error(f"Failed to connect: {e}", "CONNECTION_ERROR")
 
-    # Resolve all users
+    # Resolve all users: contact index first, remaining misses concurrently
+    contacts = await load_contact_index(client)
+    entities = await asyncio.gather(*(resolve_user(client, u, contacts) for u in user_args))
+
     resolved_users = []
     failed_users = []
-    for user_arg in user_args:
-        entity = await resolve_user(client, user_arg)
+    for user_arg, entity in zip(user_args, entities):
         if entity:
             resolved_users.append(entity)
         else:
@@ -115,12 +162,12 @@ async def create_group(title: str, user_args: list[str], message: str | None = N
     first_message = None
     if message and message.strip() and chat:
         try:
-            entity = await client.get_entity(chat_id)
-            msg_result = await client.send_message(entity, message)
+            # The Chat from CreateChatRequest is already a full entity
+            msg_result = await client.send_message(chat, message)
             first_message = {
                 "messageId": msg_result.id,
                 "text": message,
-                "date": msg_result.date.isoformat() if msg_result.date else None,
+                "date": msg_result.date,
             }
         except Exception as e:
             # Group was created but message failed — still report success
@@ -147,7 +194,7 @@ def main():
     parser.add_argument("--message", type=str, help="First message to send in the group")
     args = parser.parse_args()
 
-    asyncio.run(create_group(args.title, args.users, args.message))
+    run(create_group(args.title, args.users, args.message))
 
 
 if __name__ == "__main__":
@@ -6,25 +6,33 @@ Returns structured data for the LLM to process into action items.
 Updates watermarks after successful fetch so the next run skips these messages.
 
 Usage:
-  uv run scripts/digest.py [--chats "Chat A,Chat B"] [--limit 50] [--max-total 200] [--include-read] [--dry-run]
+  uv run scripts/digest.py [--chats "Chat A,Chat B"] [--limit 50] [--max-total 200] [--include-read] [--dry-run] [--concurrency 5] [--summary-only]
 
 Without --chats, processes all chats that have unread messages OR have watermarks
 (so chats you've digested before get checked even if Telegram shows them as read).
 
+--chats: Selects every chat whose title contains one of the names, or whose
+  username matches one exactly.
 --include-read: Also check watermarked chats even if Telegram says 0 unread.
 --dry-run: Fetch and output but don't update watermarks.
+--concurrency: How many chats to fetch from Telegram at once.
+--summary-only: For never-digested chats with a huge unread backlog, skip the
+  backlog (report its size, advance the watermark) instead of fetching it.
 """
 
 import argparse
 import asyncio
+import re
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_message, classify_entity
+from _client import get_client, output, error, format_messages, classify_entity, call_with_retry, run
 from _watermarks import load_watermarks, set_watermarks_batch
 
-from telethon.errors import FloodWaitError
+# With --summary-only, a chat without a watermark whose unread count exceeds
+# this many times the per-chat limit is skipped rather than sampled.
+BACKLOG_FACTOR = 5
 
 
 async def run_digest(
@@ -33,7 +41,11 @@ async def run_digest(
     max_total: int = 200,
     include_read: bool = False,
     dry_run: bool = False,
+    concurrency: int = 5,
+    summary_only: bool = False,
 ):
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -43,50 +55,56 @@ async def run_digest(
 
     watermarks = load_watermarks()
 
-    # Get all dialogs
-    try:
-        dialogs = await client.get_dialogs(limit=500)
-    except FloodWaitError as e:
-        error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
-    except Exception as e:
-        error(f"Failed to get dialogs: {e}", "API_ERROR")
-
     # Decide which chats to process
     chats_to_process = []
 
-    for d in dialogs:
+    def add_chat(d):
         chat_id = str(d.entity.id)
-        chat_name = d.name or "Unknown"
-        has_watermark = chat_id in watermarks
-        has_unread = d.unread_count > 0
-
-        # If user specified chats, only include those
-        if chat_filter:
-            match = False
-            for f in chat_filter:
-                fl = f.lower()
-                if chat_name.lower() == fl or fl in chat_name.lower():
-                    match = True
-                    break
-                if getattr(d.entity, "username", None) and f.lstrip("@").lower() == d.entity.username.lower():
-                    match = True
-                    break
-            if not match:
-                continue
-        else:
-            # Auto-select: unread chats, or watermarked chats if include_read
-            if not has_unread and not (include_read and has_watermark):
-                continue
-
+        wm = watermarks.get(chat_id)
         chats_to_process.append({
             "dialog": d,
             "chatId": chat_id,
-            "chatName": chat_name,
+            "chatName": d.name or "Unknown",
             "unreadCount": d.unread_count,
-            "hasWatermark": has_watermark,
-            "watermarkMessageId": watermarks.get(chat_id, {}).get("lastMessageId"),
+            "hasWatermark": wm is not None,
+            "watermarkMessageId": wm.get("lastMessageId") if wm else None,
         })
 
+    try:
+        if chat_filter:
+            # Select every chat whose title contains a filter, or whose
+            # username equals one: one regex search per title and one set
+            # lookup per username, instead of a loop over the filters
+            filters = list(dict.fromkeys(f.lower() for f in chat_filter))
+            name_pattern = re.compile("|".join(re.escape(f) for f in filters))
+            usernames = {f.lstrip("@") for f in filters}
+
+            def matches(d):
+                username = getattr(d.entity, "username", None)
+                return bool(
+                    name_pattern.search((d.name or "Unknown").lower())
+                    or (username and username.lower() in usernames)
+                )
+
+            # Collected per attempt, so a retried scan starts over cleanly
+            async def scan_dialogs():
+                return [d async for d in client.iter_dialogs(limit=500) if matches(d)]
+
+            selected = await call_with_retry(scan_dialogs)
+        else:
+            dialogs = await call_with_retry(lambda: client.get_dialogs(limit=500))
+            # Auto-select: unread chats, or watermarked chats if include_read
+            selected = [
+                d for d in dialogs
+                if d.unread_count > 0 or (include_read and str(d.entity.id) in watermarks)
+            ]
+        for d in selected:
+            add_chat(d)
+    except FloodWaitError as e:
+        error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
+    except Exception as e:
+        error(f"Failed to get dialogs: {e}", "API_ERROR")
+
     if not chats_to_process:
         await client.disconnect()
         output({
@@ -111,78 +129,119 @@ async def run_digest(
 
     chats_to_process.sort(key=chat_priority)
 
-    # Fetch new messages from each chat
+    def is_backlog(chat):
+        return (
+            summary_only
+            and not chat["hasWatermark"]
+            and chat["unreadCount"] > limit_per_chat * BACKLOG_FACTOR
+        )
+
+    async def fetch_chat(chat, fetch_limit):
+        """Fetch new messages for one chat. Returns (messages, error_message)."""
+        try:
+            # If we have a watermark, use min_id to get only newer messages
+            kwargs = {"limit": fetch_limit}
+            if chat["watermarkMessageId"]:
+                kwargs["min_id"] = int(chat["watermarkMessageId"])
+            return await call_with_retry(lambda: client.get_messages(chat["dialog"].entity, **kwargs)), None
+        except FloodWaitError as e:
+            # Skip this chat, don't fail the whole digest
+            return None, f"Rate limited ({e.seconds}s)"
+        except Exception as e:
+            return None, str(e)
+
+    # Fetch new messages, `concurrency` chats at a time in priority order.
+    # Each window is sized against the budget left before it starts, and
+    # results are applied in order, so maxTotal behaves as if sequential.
     digest_chats = []
     skipped_chats = []
     watermark_updates = []
     total_new = 0
 
-    for chat in chats_to_process:
-        # Enforce max_total budget
+    for start in range(0, len(chats_to_process), concurrency):
+        window = chats_to_process[start:start + concurrency]
         remaining = max_total - total_new
         if remaining <= 0:
-            skipped_chats.append(chat["chatName"])
+            skipped_chats.extend(c["chatName"] for c in window)
             continue
 
-        d = chat["dialog"]
-        entity = d.entity
-        wm_msg_id = chat["watermarkMessageId"]
-
         # Use the smaller of limit_per_chat and remaining budget
-        effective_limit = min(limit_per_chat, remaining)
+        fetch_limit = min(limit_per_chat, remaining)
+        # Backlog chats only need their newest message ID for the watermark
+        results = await asyncio.gather(*(
+            fetch_chat(c, 1 if is_backlog(c) else fetch_limit) for c in window
+        ))
+
+        for chat, (messages, fetch_error) in zip(window, results):
+            # Enforce max_total budget
+            remaining = max_total - total_new
+            if remaining <= 0:
+                skipped_chats.append(chat["chatName"])
+                continue
 
-        try:
-            # If we have a watermark, use min_id to get only newer messages
-            kwargs = {"limit": effective_limit}
-            if wm_msg_id:
-                kwargs["min_id"] = int(wm_msg_id)
+            entity = chat["dialog"].entity
+            wm_msg_id = chat["watermarkMessageId"]
 
-            messages = await client.get_messages(entity, **kwargs)
-        except FloodWaitError as e:
-            # Skip this chat, don't fail the whole digest
-            digest_chats.append({
-                "chat": {"id": chat["chatId"], "name": chat["chatName"], "type": classify_entity(entity)},
-                "error": f"Rate limited ({e.seconds}s)",
-                "messages": [],
-                "newCount": 0,
-            })
-            continue
-        except Exception as e:
-            digest_chats.append({
-                "chat": {"id": chat["chatId"], "name": chat["chatName"], "type": classify_entity(entity)},
-                "error": str(e),
-                "messages": [],
-                "newCount": 0,
-            })
-            continue
+            if fetch_error:
+                digest_chats.append({
+                    "chat": {"id": chat["chatId"], "name": chat["chatName"], "type": classify_entity(entity)},
+                    "error": fetch_error,
+                    "messages": [],
+                    "newCount": 0,
+                })
+                continue
 
-        if not messages:
-            continue
+            if not messages:
+                continue
 
-        # Format messages (newest first from Telegram, reverse for chronological)
-        formatted = [format_message(msg) for msg in reversed(messages)]
-        total_new += len(formatted)
-
-        # Track the highest message ID for watermark
-        max_msg_id = max(int(m["id"]) for m in formatted)
-
-        digest_chats.append({
-            "chat": {
-                "id": chat["chatId"],
-                "name": chat["chatName"],
-                "type": classify_entity(entity),
-                "username": getattr(entity, "username", None),
-            },
-            "messages": formatted,
-            "newCount": len(formatted),
-            "previousWatermark": wm_msg_id,
-        })
+            if is_backlog(chat):
+                digest_chats.append({
+                    "chat": {
+                        "id": chat["chatId"],
+                        "name": chat["chatName"],
+                        "type": classify_entity(entity),
+                        "username": getattr(entity, "username", None),
+                    },
+                    "messages": [],
+                    "newCount": 0,
+                    "skipped": True,
+                    "unreadCount": chat["unreadCount"],
+                    "note": "Too many unread messages to digest; watermark advanced past them.",
+                })
+                watermark_updates.append({
+                    "chatId": chat["chatId"],
+                    "messageId": messages[0].id,
+                    "chatName": chat["chatName"],
+                })
+                continue
 
-        watermark_updates.append({
-            "chatId": chat["chatId"],
-            "messageId": max_msg_id,
-            "chatName": chat["chatName"],
-        })
+            # Newest first from Telegram: keep the newest that fit the budget
+            messages = messages[:remaining]
+
+            # Format messages (reverse for chronological)
+            formatted = format_messages(reversed(messages))
+            total_new += len(formatted)
+
+            # Newest first, so the first message carries the watermark ID
+            max_msg_id = messages[0].id
+
+            digest_chats.append({
+                "chat": {
+                    "id": chat["chatId"],
+                    "name": chat["chatName"],
+                    "type": classify_entity(entity),
+                    "username": getattr(entity, "username", None),
+                },
+                "messages": formatted,
+                "newCount": len(formatted),
+                "previousWatermark": wm_msg_id,
+            })
+
+            watermark_updates.append({
+                "chatId": chat["chatId"],
+                "messageId": max_msg_id,
+                "chatName": chat["chatName"],
+            })
 
     await client.disconnect()
 
@@ -209,7 +268,7 @@ async def run_digest(
 
 def main():
     parser = argparse.ArgumentParser(description="Fetch new messages for digest")
-    parser.add_argument("--chats", type=str, help="Comma-separated chat names to check (default: all unread)")
+    parser.add_argument("--chats", type=str, help="Comma-separated chat names: selects every chat whose title contains one, or whose username matches one exactly (default: all unread)")
     parser.add_argument("--limit", type=int, default=50, help="Max messages per chat (default: 50)")
     parser.add_argument("--max-total", type=int, default=200,
                         help="Max total messages across all chats (default: 200). Prevents context overflow.")
@@ -217,10 +276,17 @@ def main():
                         help="Also check previously-watermarked chats even if 0 unread")
     parser.add_argument("--dry-run", action="store_true",
                         help="Fetch messages but don't update watermarks")
+    parser.add_argument("--concurrency", type=int, default=5,
+                        help="Chats fetched in parallel (default: 5). Lower if you hit flood waits.")
+    parser.add_argument("--summary-only", action="store_true",
+                        help=f"Skip never-digested chats with more than {BACKLOG_FACTOR}x --limit unread, "
+                             "advancing their watermark instead of fetching the backlog")
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
 
     chat_filter = [c.strip() for c in args.chats.split(",")] if args.chats else None
-    asyncio.run(run_digest(chat_filter, args.limit, args.max_total, args.include_read, args.dry_run))
+    run(run_digest(chat_filter, args.limit, args.max_total, args.include_read, args.dry_run, args.concurrency, args.summary_only))
 
 
 if __name__ == "__main__":
@@ -10,16 +10,43 @@ Not wrapped as a pi tool — this is for bulk operations.
 
 import argparse
 import asyncio
-import json
 import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_message, resolve_chat, parse_date
+from _client import get_client, output, error, format_message, entity_name, resolve_chat, parse_date, run
+
+# Lines are batched into chunks of about this size before hitting the disk
+WRITE_CHUNK_SIZE = 1 << 20
+
+
+def make_line_encoder(chat_id: str, chat_name: str):
+    """Build an encoder for one export line with the chat fields pre-serialized.
+
+    chatId/chatName are the same for every message, so they are encoded once
+    and spliced in place of each message's closing brace instead of being
+    stored into every formatted dict.
+    """
+    suffix = b',"chatId":' + orjson.dumps(chat_id) + b',"chatName":' + orjson.dumps(chat_name) + b"}\n"
+
+    def encode(formatted: dict) -> bytes:
+        return orjson.dumps(formatted, default=str)[:-1] + suffix
 
-from telethon.errors import FloodWaitError
+    return encode
+
+
+async def write_chunks(queue: asyncio.Queue, out_file):
+    """Write queued byte chunks until None arrives.
+
+    Each write runs in a worker thread, so the event loop keeps receiving
+    messages from Telegram while the previous chunk goes to disk.
+    """
+    while (chunk := await queue.get()) is not None:
+        await asyncio.to_thread(out_file.write, chunk)
 
 
 async def export_history(
@@ -28,6 +55,8 @@ async def export_history(
     since: str | None = None,
     batch_size: int = 100,
 ):
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -42,33 +71,70 @@ async def export_history(
 
     min_date = parse_date(since) if since else None
 
-    chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+    chat_name = entity_name(entity)
 
     # Determine output
     if output_path:
-        out_file = open(output_path, "w")
+        out_file = open(output_path, "wb")
     else:
         import tempfile
         fd, output_path = tempfile.mkstemp(suffix=".jsonl", prefix=f"telegram-{chat_name.replace(' ', '_')[:30]}-")
-        out_file = open(fd, "w")
+        out_file = open(fd, "wb")
+
+    encode_line = make_line_encoder(str(entity.id), chat_name)
+
+    # Encoded lines collect in buf; full chunks go to the writer task
+    buf = bytearray()
+    queue = asyncio.Queue(maxsize=4)
+    writer = asyncio.create_task(write_chunks(queue, out_file))
+
+    async def put_chunk(chunk: bytes | None):
+        # Wait on the writer too: if a write fails, nothing drains the queue
+        # and a plain put() would block forever. Re-raise its error instead.
+        if not writer.done() and not queue.full():
+            queue.put_nowait(chunk)
+            return
+        put = asyncio.ensure_future(queue.put(chunk))
+        await asyncio.wait((put, writer), return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            put.cancel()
+            writer.result()
+
+    async def finish_writes():
+        try:
+            if not writer.done():
+                if buf:
+                    await put_chunk(bytes(buf))
+                    buf.clear()
+                await put_chunk(None)
+            await writer
+        finally:
+            out_file.close()
 
     total = 0
+    flood_wait = None
     try:
         async for msg in client.iter_messages(entity, limit=None):
             if min_date and msg.date and msg.date < min_date:
                 break
 
-            formatted = format_message(msg)
-            formatted["chatId"] = str(entity.id)
-            formatted["chatName"] = chat_name
-            out_file.write(json.dumps(formatted, default=str, ensure_ascii=False) + "\n")
+            buf += encode_line(format_message(msg))
+            if len(buf) >= WRITE_CHUNK_SIZE:
+                await put_chunk(bytes(buf))
+                buf.clear()
             total += 1
 
             if total % batch_size == 0:
-                print(json.dumps({"status": "progress", "exported": total}), file=sys.stderr)
+                sys.stderr.buffer.write(orjson.dumps({"status": "progress", "exported": total}, option=orjson.OPT_APPEND_NEWLINE))
+                sys.stderr.flush()
 
     except FloodWaitError as e:
-        out_file.close()
+        flood_wait = e.seconds
+    finally:
+        # Always flush what was fetched and stop the writer, even on errors
+        await finish_writes()
+
+    if flood_wait is not None:
         await client.disconnect()
         # Partial export is still useful
         output({
@@ -76,12 +142,11 @@ async def export_history(
             "outputPath": output_path,
             "chat": chat_name,
             "partial": True,
-            "floodWait": e.seconds,
-            "note": f"Rate limited after {total} messages. Retry in {e.seconds}s to continue.",
+            "floodWait": flood_wait,
+            "note": f"Rate limited after {total} messages. Retry in {flood_wait}s to continue.",
         })
         return
 
-    out_file.close()
     await client.disconnect()
 
     output({
@@ -100,7 +165,7 @@ def main():
     parser.add_argument("--batch-size", type=int, default=100, help="Progress report interval")
     args = parser.parse_args()
 
-    asyncio.run(export_history(args.chat, args.output, args.since, args.batch_size))
+    run(export_history(args.chat, args.output, args.since, args.batch_size))
 
 
 if __name__ == "__main__":
@@ -7,20 +7,19 @@ Usage:
 """
 
 import argparse
-import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_sender, resolve_chat, classify_entity
-
-from telethon.errors import FloodWaitError, ChatAdminRequiredError
-from telethon.tl.types import User, Chat, Channel, ChannelParticipantsRecent
-from telethon.tl.functions.channels import GetFullChannelRequest, GetParticipantsRequest
-from telethon.tl.functions.messages import GetFullChatRequest
+from _client import get_client, output, error, format_sender, full_name, entity_name, resolve_chat, classify_entity, call_with_retry, run
 
 
 async def get_info(chat_arg: str, all_members: bool = False):
+    from telethon.errors import FloodWaitError, ChatAdminRequiredError
+    from telethon.tl.types import User, Chat, Channel, ChannelParticipantsRecent, InputMessagesFilterPinned
+    from telethon.tl.functions.channels import GetFullChannelRequest, GetParticipantsRequest
+    from telethon.tl.functions.messages import GetFullChatRequest
+
     client = get_client()
 
     try:
@@ -34,7 +33,7 @@ async def get_info(chat_arg: str, all_members: bool = False):
         error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
 
     chat_type = classify_entity(entity)
-    chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+    chat_name = entity_name(entity)
 
     info = {
         "id": str(entity.id),
@@ -46,21 +45,20 @@ async def get_info(chat_arg: str, all_members: bool = False):
     # Get full info
     try:
         if isinstance(entity, Channel):
-            full = await client(GetFullChannelRequest(entity))
+            full = await call_with_retry(lambda: client(GetFullChannelRequest(entity)))
             info["description"] = full.full_chat.about or None
             info["memberCount"] = full.full_chat.participants_count
-            info["created"] = entity.date.isoformat() if entity.date else None
+            info["created"] = entity.date
 
             # Pinned messages
             pinned = []
             try:
-                async for msg in client.iter_messages(entity, filter=None, limit=5):
-                    if msg.pinned:
-                        pinned.append({
-                            "id": str(msg.id),
-                            "text": (msg.text or "")[:200],
-                            "date": msg.date.isoformat() if msg.date else None,
-                        })
+                async for msg in client.iter_messages(entity, filter=InputMessagesFilterPinned(), limit=5):
+                    pinned.append({
+                        "id": str(msg.id),
+                        "text": (msg.text or "")[:200],
+                        "date": msg.date,
+                    })
             except Exception:
                 pass
             info["pinnedMessages"] = pinned
@@ -85,19 +83,30 @@ async def get_info(chat_arg: str, all_members: bool = False):
                 info["members"] = members
 
         elif isinstance(entity, Chat):
-            full = await client(GetFullChatRequest(entity.id))
+            full = await call_with_retry(lambda: client(GetFullChatRequest(entity.id)))
             info["description"] = full.full_chat.about or None
             info["memberCount"] = getattr(full.full_chat, "participants_count", None)
 
             # Members from chat participants
             members = []
             if hasattr(full.full_chat, "participants") and full.full_chat.participants:
-                for p in full.full_chat.participants.participants:
+                user_ids = [p.user_id for p in full.full_chat.participants.participants]
+                # GetFullChat already returns the participants' users; only
+                # look up the stragglers, in one batched call.
+                users_by_id = {u.id: u for u in full.users}
+                missing = [uid for uid in user_ids if uid not in users_by_id]
+                if missing:
                     try:
-                        user = await client.get_entity(p.user_id)
-                        members.append(format_sender(user))
+                        for u in await client.get_entity(missing):
+                            users_by_id[u.id] = u
                     except Exception:
-                        members.append({"id": str(p.user_id), "name": "Unknown"})
+                        pass
+                for uid in user_ids:
+                    user = users_by_id.get(uid)
+                    if user is not None:
+                        members.append(format_sender(user))
+                    else:
+                        members.append({"id": str(uid), "name": "Unknown"})
             if members:
                 info["members"] = members
 
@@ -105,8 +114,7 @@ async def get_info(chat_arg: str, all_members: bool = False):
             # Don't expose other users' phone numbers in tool output
             info["hasPhone"] = bool(entity.phone)
             info["isBot"] = entity.bot or False
-            name_parts = [entity.first_name or "", entity.last_name or ""]
-            info["fullName"] = " ".join(p for p in name_parts if p)
+            info["fullName"] = full_name(entity.first_name, entity.last_name)
             if entity.status:
                 status_name = type(entity.status).__name__
                 info["status"] = status_name.replace("UserStatus", "").lower()
@@ -126,7 +134,7 @@ def main():
     parser.add_argument("--all-members", action="store_true", help="Fetch up to 200 members (default: 50)")
     args = parser.parse_args()
 
-    asyncio.run(get_info(args.chat, args.all_members))
+    run(get_info(args.chat, args.all_members))
 
 
 if __name__ == "__main__":
@@ -9,17 +9,16 @@ Chat can be a name, @username, or numeric ID.
 """
 
 import argparse
-import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, resolve_chat
-
-from telethon.errors import FloodWaitError
+from _client import get_client, output, error, entity_name, resolve_chat, run
 
 
 async def leave_chat(chat_arg: str, delete: bool = False):
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -32,7 +31,7 @@ async def leave_chat(chat_arg: str, delete: bool = False):
         await client.disconnect()
         error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
 
-    chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+    chat_name = entity_name(entity)
 
     try:
         if delete:
@@ -71,7 +70,7 @@ def main():
     parser.add_argument("--delete", action="store_true", help="Also delete the chat history")
     args = parser.parse_args()
 
-    asyncio.run(leave_chat(args.chat, args.delete))
+    run(leave_chat(args.chat, args.delete))
 
 
 if __name__ == "__main__":
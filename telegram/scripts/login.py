@@ -32,24 +32,19 @@ Usage (manual / legacy):
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import save_session, output, error, SESSION_PATH
-
-from telethon import TelegramClient
-from telethon.sessions import StringSession
-from telethon.errors import (
-    PhoneCodeInvalidError,
-    PhoneCodeExpiredError,
-    PasswordHashInvalidError,
-    SessionPasswordNeededError,
-    FloodWaitError,
-    PhoneNumberInvalidError,
-)
+from _client import save_session, full_name, output, error, telegram_client, SESSION_PATH, run
+from _files import write_json_atomic
+
+if TYPE_CHECKING:
+    from telethon import TelegramClient
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -78,7 +73,7 @@ def load_app_credentials(cli_api_id: int | None, cli_api_hash: str | None) -> tu
     if not api_id or not api_hash:
         if APP_CONFIG_PATH.exists():
             try:
-                data = json.loads(APP_CONFIG_PATH.read_text())
+                data = orjson.loads(APP_CONFIG_PATH.read_bytes())
                 api_id = api_id or int(data.get("apiId", 0))
                 api_hash = api_hash or data.get("apiHash", "")
             except Exception:
@@ -103,15 +98,13 @@ def load_pending() -> dict:
     if not PENDING_PATH.exists():
         error("No pending login session found. Run 'login.py request-code' first.", "NO_PENDING")
     try:
-        return json.loads(PENDING_PATH.read_text())
+        return orjson.loads(PENDING_PATH.read_bytes())
     except Exception:
         error("Corrupt pending session. Run 'login.py request-code' again.", "NO_PENDING")
 
 
 def save_pending(data: dict) -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    PENDING_PATH.write_text(json.dumps(data, indent=2))
-    PENDING_PATH.chmod(0o600)
+    write_json_atomic(PENDING_PATH, data)
 
 
 def clear_pending() -> None:
@@ -121,6 +114,34 @@ def clear_pending() -> None:
         pass
 
 
+# ---------------------------------------------------------------------------
+# Sign-in completion (shared by sign-in and sign-in-2fa)
+# ---------------------------------------------------------------------------
+
+async def finish_sign_in(client: "TelegramClient", api_id: int, api_hash: str, phone: str) -> None:
+    """Persist the authorized session, clear pending state and output the user.
+
+    Runs inside telegram_client(), which disconnects once output() exits.
+    """
+    # Save final session while get_me is in flight
+    final_session = client.session.save()
+    me, _, _ = await asyncio.gather(
+        client.get_me(),
+        asyncio.to_thread(save_session, api_id, api_hash, phone, final_session),
+        asyncio.to_thread(clear_pending),
+    )
+
+    name = full_name(me.first_name, me.last_name)
+
+    output({
+        "success": True,
+        "phone": phone,
+        "name": name,
+        "username": me.username,
+        "userId": str(me.id),
+    })
+
+
 # ---------------------------------------------------------------------------
 # Phase 1: request-code
 # ---------------------------------------------------------------------------
@@ -130,26 +151,23 @@ async def cmd_request_code(phone: str, api_id: int, api_hash: str) -> None:
     Connect to Telegram and send an OTP to the user's phone/app.
     Saves pending state (phone, phone_code_hash, api_id, api_hash, partial session).
     """
-    client = TelegramClient(StringSession(), api_id, api_hash)
-
-    try:
-        await client.connect()
-    except Exception as e:
-        error(f"Failed to connect to Telegram: {e}", "CONNECTION_ERROR")
-
-    try:
-        result = await client.send_code_request(phone)
-    except PhoneNumberInvalidError:
-        error(f"Invalid phone number: {phone}", "INVALID_PHONE")
-    except FloodWaitError as e:
-        error(f"Rate limited. Try again in {e.seconds} seconds.", "FLOOD_WAIT")
-    except Exception as e:
-        error(f"Failed to send code: {e}", "CODE_SEND_ERROR")
-
-    # Save the MTProto session (DC + auth key) so phase 2 can reuse it.
-    # This avoids re-doing the DH handshake and is more reliable than a fresh connection.
-    session_string = client.session.save()
-    await client.disconnect()
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+    from telethon.errors import FloodWaitError, PhoneNumberInvalidError
+
+    async with telegram_client(TelegramClient(StringSession(), api_id, api_hash)) as client:
+        try:
+            result = await client.send_code_request(phone)
+        except PhoneNumberInvalidError:
+            error(f"Invalid phone number: {phone}", "INVALID_PHONE")
+        except FloodWaitError as e:
+            error(f"Rate limited. Try again in {e.seconds} seconds.", "FLOOD_WAIT")
+        except Exception as e:
+            error(f"Failed to send code: {e}", "CODE_SEND_ERROR")
+
+        # Save the MTProto session (DC + auth key) so phase 2 can reuse it.
+        # This avoids re-doing the DH handshake and is more reliable than a fresh connection.
+        session_string = client.session.save()
 
     save_pending({
         "phone": phone,
@@ -173,6 +191,10 @@ async def cmd_sign_in(code: str) -> None:
     If 2FA is required: saves the 2FA-pending session to pending.json and exits
     with {"status": "2fa_required"} so the caller can run sign-in-2fa.
     """
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+    from telethon.errors import PhoneCodeInvalidError, PhoneCodeExpiredError, SessionPasswordNeededError
+
     pending = load_pending()
     phone = pending["phone"]
     phone_code_hash = pending["phoneCodeHash"]
@@ -180,57 +202,31 @@ async def cmd_sign_in(code: str) -> None:
     api_hash = pending["apiHash"]
     session_string = pending.get("sessionString", "")
 
-    client = TelegramClient(StringSession(session_string), api_id, api_hash)
+    async with telegram_client(TelegramClient(StringSession(session_string), api_id, api_hash)) as client:
+        try:
+            await client.sign_in(phone, code, phone_code_hash=phone_code_hash)
 
-    try:
-        await client.connect()
-    except Exception as e:
-        error(f"Failed to connect to Telegram: {e}", "CONNECTION_ERROR")
+        except SessionPasswordNeededError:
+            # Save the 2FA-pending session so sign-in-2fa can resume from this exact state.
+            # At this point Telethon has validated the OTP server-side; the session encodes
+            # the "authenticated but 2FA pending" MTProto state.
+            pending["sessionString"] = client.session.save()
+            pending["phase"] = "2fa"
+            save_pending(pending)
+            output({"status": "2fa_required"})
 
-    try:
-        await client.sign_in(phone, code, phone_code_hash=phone_code_hash)
-
-    except SessionPasswordNeededError:
-        # Save the 2FA-pending session so sign-in-2fa can resume from this exact state.
-        # At this point Telethon has validated the OTP server-side; the session encodes
-        # the "authenticated but 2FA pending" MTProto state.
-        pending["sessionString"] = client.session.save()
-        pending["phase"] = "2fa"
-        await client.disconnect()
-        save_pending(pending)
-        output({"status": "2fa_required"})
-
-    except PhoneCodeInvalidError:
-        await client.disconnect()
-        error("Invalid verification code.", "INVALID_CODE")
-
-    except PhoneCodeExpiredError:
-        await client.disconnect()
-        clear_pending()
-        error("Verification code expired. Run /telegram-login again.", "CODE_EXPIRED")
-
-    except Exception as e:
-        await client.disconnect()
-        error(f"Sign-in failed: {e}", "SIGN_IN_ERROR")
-
-    else:
-        # Success — save final session
-        final_session = client.session.save()
-        me = await client.get_me()
-        await client.disconnect()
-        clear_pending()
-
-        name_parts = [me.first_name or "", me.last_name or ""]
-        name = " ".join(p for p in name_parts if p)
-        save_session(api_id, api_hash, phone, final_session)
-
-        output({
-            "success": True,
-            "phone": phone,
-            "name": name,
-            "username": me.username,
-            "userId": str(me.id),
-        })
+        except PhoneCodeInvalidError:
+            error("Invalid verification code.", "INVALID_CODE")
+
+        except PhoneCodeExpiredError:
+            clear_pending()
+            error("Verification code expired. Run /telegram-login again.", "CODE_EXPIRED")
+
+        except Exception as e:
+            error(f"Sign-in failed: {e}", "SIGN_IN_ERROR")
+
+        else:
+            await finish_sign_in(client, api_id, api_hash, phone)
 
 
 # ---------------------------------------------------------------------------
@@ -242,6 +238,10 @@ async def cmd_sign_in_2fa(password: str) -> None:
     Load the 2FA-pending session from pending.json and complete sign-in
     by submitting the account password.
     """
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+    from telethon.errors import PasswordHashInvalidError
+
     pending = load_pending()
 
     if pending.get("phase") != "2fa":
@@ -252,38 +252,15 @@ async def cmd_sign_in_2fa(password: str) -> None:
     api_hash = pending["apiHash"]
     session_string = pending["sessionString"]
 
-    client = TelegramClient(StringSession(session_string), api_id, api_hash)
-
-    try:
-        await client.connect()
-    except Exception as e:
-        error(f"Failed to connect to Telegram: {e}", "CONNECTION_ERROR")
-
-    try:
-        await client.sign_in(password=password)
-    except PasswordHashInvalidError:
-        await client.disconnect()
-        error("Invalid 2FA password.", "INVALID_2FA")
-    except Exception as e:
-        await client.disconnect()
-        error(f"2FA sign-in failed: {e}", "SIGN_IN_ERROR")
-
-    final_session = client.session.save()
-    me = await client.get_me()
-    await client.disconnect()
-    clear_pending()
+    async with telegram_client(TelegramClient(StringSession(session_string), api_id, api_hash)) as client:
+        try:
+            await client.sign_in(password=password)
+        except PasswordHashInvalidError:
+            error("Invalid 2FA password.", "INVALID_2FA")
+        except Exception as e:
+            error(f"2FA sign-in failed: {e}", "SIGN_IN_ERROR")
 
-    name_parts = [me.first_name or "", me.last_name or ""]
-    name = " ".join(p for p in name_parts if p)
-    save_session(api_id, api_hash, phone, final_session)
-
-    output({
-        "success": True,
-        "phone": phone,
-        "name": name,
-        "username": me.username,
-        "userId": str(me.id),
-    })
+        await finish_sign_in(client, api_id, api_hash, phone)
 
 
 # ---------------------------------------------------------------------------
@@ -310,13 +287,13 @@ def main() -> None:
 
     if args.command == "request-code":
         api_id, api_hash = load_app_credentials(args.api_id, args.api_hash)
-        asyncio.run(cmd_request_code(args.phone, api_id, api_hash))
+        run(cmd_request_code(args.phone, api_id, api_hash))
 
     elif args.command == "sign-in":
-        asyncio.run(cmd_sign_in(args.code))
+        run(cmd_sign_in(args.code))
 
     elif args.command == "sign-in-2fa":
-        asyncio.run(cmd_sign_in_2fa(args.password))
+        run(cmd_sign_in_2fa(args.password))
 
 
 if __name__ == "__main__":
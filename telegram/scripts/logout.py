@@ -15,7 +15,12 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, SESSION_PATH
+from _client import get_client, output, error, SESSION_PATH, run
+
+# Upper bound on connect + revoke, so a slow network can't hold up the local logout
+REVOKE_TIMEOUT = 5.0
+# Separate bound on the disconnect, which can still run after REVOKE_TIMEOUT fires
+DISCONNECT_TIMEOUT = 2.0
 
 
 async def do_logout(revoke: bool = False):
@@ -23,13 +28,22 @@ async def do_logout(revoke: bool = False):
         output({"success": True, "note": "No session found, already logged out"})
 
     if revoke:
+        # get_client reuses the stored auth key, so connect skips the handshake
         try:
             client = get_client()
-            await client.connect()
-            await client.log_out()
-            await client.disconnect()
-        except Exception as e:
-            # Still delete the local file even if remote revoke fails
+
+            async def revoke_session():
+                try:
+                    await client.connect()
+                    await client.log_out()
+                finally:
+                    # When the revoke times out, this runs during its cancellation,
+                    # outside REVOKE_TIMEOUT, so it needs a bound of its own
+                    await asyncio.wait_for(client.disconnect(), DISCONNECT_TIMEOUT)
+
+            await asyncio.wait_for(revoke_session(), REVOKE_TIMEOUT)
+        except Exception:
+            # Still delete the local file even if remote revoke fails or times out
             pass
 
     SESSION_PATH.unlink(missing_ok=True)
@@ -42,7 +56,7 @@ def main():
                         help="Also revoke session on Telegram's servers")
     args = parser.parse_args()
 
-    asyncio.run(do_logout(args.revoke))
+    run(do_logout(args.revoke))
 
 
 if __name__ == "__main__":
@@ -10,15 +10,12 @@ Usage:
 
 import argparse
 import asyncio
-import json
 import sys
-from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_message, resolve_chat, classify_entity, parse_date, parse_date_end_of_day
-
-from telethon.errors import FloodWaitError
+from _client import telegram_client, output, error, format_messages, full_name, entity_name, resolve_chat, resolve_from_user, classify_entity, parse_date, parse_date_end_of_day, call_with_retry, run
 
 
 async def read_messages(
@@ -29,69 +26,54 @@ async def read_messages(
     until: str | None = None,
     from_user: str | None = None,
 ):
-    client = get_client()
-
-    try:
-        await client.connect()
-    except Exception as e:
-        error(f"Failed to connect: {e}", "CONNECTION_ERROR")
-
-    entity = await resolve_chat(client, chat_arg)
-    if not entity:
-        await client.disconnect()
-        error(f"Chat not found: '{chat_arg}'. Use telegram_chats to list available chats.", "CHAT_NOT_FOUND")
+    from telethon.errors import FloodWaitError
 
     # Parse date filters
     offset_date = parse_date_end_of_day(until) if until else None
     min_date = parse_date(since) if since else None
 
-    # Resolve from_user
-    from_entity = None
-    if from_user:
+    async with telegram_client() as client:
+        # The chat and from_user lookups are independent: run them together
+        if from_user:
+            entity, from_entity = await asyncio.gather(
+                resolve_chat(client, chat_arg),
+                resolve_from_user(client, from_user),
+            )
+        else:
+            entity, from_entity = await resolve_chat(client, chat_arg), None
+
+        if not entity:
+            error(f"Chat not found: '{chat_arg}'. Use telegram_chats to list available chats.", "CHAT_NOT_FOUND")
+        if from_user and not from_entity:
+            error(f"User not found: '{from_user}'", "USER_NOT_FOUND")
+
         try:
-            from_entity = await client.get_entity(from_user if from_user.startswith("@") else f"@{from_user}")
-        except Exception:
-            # Try as numeric ID
-            try:
-                from_entity = await client.get_entity(int(from_user))
-            except Exception:
-                await client.disconnect()
-                error(f"User not found: '{from_user}'", "USER_NOT_FOUND")
-
-    try:
-        # Fetch more than needed to account for date filtering
-        fetch_limit = limit * 2 if min_date else limit
-        messages = await client.get_messages(
-            entity,
-            limit=fetch_limit,
-            offset_id=offset_id,
-            offset_date=offset_date,
-            from_user=from_entity,
-        )
-    except FloodWaitError as e:
-        error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
-    except Exception as e:
-        error(f"Failed to read messages: {e}", "API_ERROR")
-
-    # Filter by min_date and format
-    formatted = []
-    for msg in messages:
-        if min_date and msg.date and msg.date < min_date:
-            continue
-        formatted.append(format_message(msg))
-        if len(formatted) >= limit:
-            break
+            # Fetch more than needed to account for date filtering
+            fetch_limit = limit * 2 if min_date else limit
+            messages = await call_with_retry(lambda: client.get_messages(
+                entity,
+                limit=fetch_limit,
+                offset_id=offset_id,
+                offset_date=offset_date,
+                from_user=from_entity,
+            ))
+        except FloodWaitError as e:
+            error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
+        except Exception as e:
+            error(f"Failed to read messages: {e}", "API_ERROR")
+
+    # Filter by min_date and format the first `limit` that remain
+    in_range = (m for m in messages if not (min_date and m.date and m.date < min_date))
+    formatted = format_messages(islice(in_range, limit))
 
     # Chat info
-    chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+    chat_name = entity_name(entity)
     chat_info = {
         "id": str(entity.id),
         "name": chat_name,
         "type": classify_entity(entity),
     }
 
-    await client.disconnect()
-
     output({
         "chat": chat_info,
         "messages": formatted,
@@ -112,9 +94,9 @@ def main():
     args = parser.parse_args()
 
     if args.sync:
-        asyncio.run(read_and_sync(args.chat, args.limit, args.offset_id, args.since, args.until, args.from_user))
+        run(read_and_sync(args.chat, args.limit, args.offset_id, args.since, args.until, args.from_user))
     else:
-        asyncio.run(read_messages(args.chat, args.limit, args.offset_id, args.since, args.until, args.from_user))
+        run(read_messages(args.chat, args.limit, args.offset_id, args.since, args.until, args.from_user))
 
 
 async def read_and_sync(
@@ -126,59 +108,51 @@ async def read_and_sync(
     from_user: str | None = None,
 ):
     """Read messages and push to Seed Network API."""
+    from telethon.errors import FloodWaitError
     from _sync import sync_messages
 
-    client = get_client()
-    try:
-        await client.connect()
-    except Exception as e:
-        error(f"Failed to connect: {e}", "CONNECTION_ERROR")
-
-    entity = await resolve_chat(client, chat_arg)
-    if not entity:
-        await client.disconnect()
-        error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
-
     # Parse date filters
     offset_date = parse_date_end_of_day(until) if until else None
     min_date = parse_date(since) if since else None
 
-    try:
-        messages = await client.get_messages(
-            entity,
-            limit=limit,
-            offset_id=offset_id,
-            offset_date=offset_date,
-        )
-    except FloodWaitError as e:
-        error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
-    except Exception as e:
-        error(f"Failed to read messages: {e}", "API_ERROR")
+    async with telegram_client() as client:
+        entity = await resolve_chat(client, chat_arg)
+        if not entity:
+            error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
+
+        try:
+            messages = await call_with_retry(lambda: client.get_messages(
+                entity,
+                limit=limit,
+                offset_id=offset_id,
+                offset_date=offset_date,
+            ))
+        except FloodWaitError as e:
+            error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
+        except Exception as e:
+            error(f"Failed to read messages: {e}", "API_ERROR")
 
     # Format for API
-    api_messages = []
-    for msg in messages:
-        if min_date and msg.date and msg.date < min_date:
-            continue
+    from telethon.tl.types import User as TUser
 
+    def to_api_message(msg):
         sender = msg.sender
-        sender_id = str(sender.id) if sender and hasattr(sender, "id") else None
+        sender_id = None
         sender_name = None
         sender_username = None
         sender_is_bot = False
 
-        if sender:
-            from telethon.tl.types import User as TUser
-            if isinstance(sender, TUser):
-                parts = [sender.first_name or "", sender.last_name or ""]
-                sender_name = " ".join(p for p in parts if p) or "Unknown"
+        if sender is not None:
+            sender_id = str(sender.id)
+            if type(sender) is TUser:
+                sender_name = full_name(sender.first_name, sender.last_name) or "Unknown"
                 sender_username = sender.username
                 sender_is_bot = sender.bot or False
             else:
                 sender_name = getattr(sender, "title", None) or str(sender)
                 sender_username = getattr(sender, "username", None)
 
-        api_msg = {
+        return {
             "telegramMessageId": str(msg.id),
             "senderId": sender_id,
             "senderName": sender_name,
@@ -192,9 +166,11 @@ async def read_and_sync(
             "isPinned": msg.pinned or False,
             "editDate": msg.edit_date.isoformat() if msg.edit_date else None,
         }
-        api_messages.append(api_msg)
 
-    await client.disconnect()
+    api_messages = [
+        to_api_message(msg) for msg in messages
+        if not (min_date and msg.date and msg.date < min_date)
+    ]
 
     if not api_messages:
         output({"synced": 0, "chat": chat_arg, "note": "No messages to sync"})
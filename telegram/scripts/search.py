@@ -9,13 +9,10 @@ Usage:
 import argparse
 import asyncio
 import sys
-from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, format_message, resolve_chat, classify_entity, parse_date
-
-from telethon.errors import FloodWaitError
+from _client import get_client, output, error, format_message, entity_name, resolve_chat, resolve_from_user, classify_entity, parse_date, call_with_retry, run
 
 
 async def search_messages(
@@ -28,6 +25,8 @@ async def search_messages(
     if not query or len(query.strip()) < 2:
         error("Search query must be at least 2 characters", "INVALID_QUERY")
 
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -35,59 +34,54 @@ async def search_messages(
     except Exception as e:
         error(f"Failed to connect: {e}", "CONNECTION_ERROR")
 
-    # Resolve chat if specified
-    entity = None
-    if chat_arg:
-        entity = await resolve_chat(client, chat_arg)
-        if not entity:
-            await client.disconnect()
-            error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
-
-    # Resolve from_user
-    from_entity = None
-    if from_user:
-        try:
-            from_entity = await client.get_entity(from_user if from_user.startswith("@") else f"@{from_user}")
-        except Exception:
-            try:
-                from_entity = await client.get_entity(int(from_user))
-            except Exception:
-                pass
+    # Resolve chat and from_user (independent lookups, so run them together)
+    async def no_lookup():
+        return None
+
+    entity, from_entity = await asyncio.gather(
+        resolve_chat(client, chat_arg) if chat_arg else no_lookup(),
+        resolve_from_user(client, from_user) if from_user else no_lookup(),
+    )
+    if chat_arg and not entity:
+        await client.disconnect()
+        error(f"Chat not found: '{chat_arg}'", "CHAT_NOT_FOUND")
 
     min_date = parse_date(since) if since else None
 
+    if entity:
+        # Search within a specific chat
+        search_args = dict(search=query, limit=limit, from_user=from_entity)
+    else:
+        # Global search across all chats
+        search_args = dict(search=query, limit=limit * 2)
+
+    async def fetch():
+        if not min_date:
+            return await client.get_messages(entity, **search_args)
+        # Results come newest first, so stop paging at the first one before --since
+        # (Telethon's search requests don't expose Telegram's min_date)
+        found = []
+        async for msg in client.iter_messages(entity, **search_args):
+            if msg.date and msg.date < min_date:
+                break
+            found.append(msg)
+        return found
+
     try:
-        if entity:
-            # Search within a specific chat
-            messages = await client.get_messages(
-                entity,
-                search=query,
-                limit=limit,
-                from_user=from_entity,
-            )
-        else:
-            # Global search across all chats
-            messages = []
-            async for msg in client.iter_messages(None, search=query, limit=limit * 2):
-                messages.append(msg)
-                if len(messages) >= limit * 2:
-                    break
+        messages = await call_with_retry(fetch)
     except FloodWaitError as e:
         error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
     except Exception as e:
         error(f"Search failed: {e}", "API_ERROR")
 
-    # Filter and format
+    # Format
     formatted = []
     for msg in messages:
-        if min_date and msg.date and msg.date < min_date:
-            continue
-
         formatted_msg = format_message(msg)
 
         # Add chat context for global searches
         if not entity and msg.chat:
-            chat_name = getattr(msg.chat, "title", None) or getattr(msg.chat, "first_name", None) or "Unknown"
+            chat_name = entity_name(msg.chat)
             formatted_msg["chat"] = {
                 "id": str(msg.chat.id),
                 "name": chat_name,
@@ -106,7 +100,7 @@ async def search_messages(
         "count": len(formatted),
     }
     if entity:
-        chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+        chat_name = entity_name(entity)
         result["chat"] = {"id": str(entity.id), "name": chat_name, "type": classify_entity(entity)}
 
     output(result)
@@ -121,7 +115,7 @@ def main():
     parser.add_argument("--since", type=str, help="Only messages after this date")
     args = parser.parse_args()
 
-    asyncio.run(search_messages(args.query, args.chat, args.limit, args.from_user, args.since))
+    run(search_messages(args.query, args.chat, args.limit, args.from_user, args.since))
 
 
 if __name__ == "__main__":
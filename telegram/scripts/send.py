@@ -7,20 +7,19 @@ Usage:
 """
 
 import argparse
-import asyncio
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, resolve_chat
-
-from telethon.errors import FloodWaitError
+from _client import get_client, output, error, entity_name, resolve_chat, run
 
 
 async def send_message(chat_arg: str, message: str, reply_to: int | None = None):
     if not message.strip():
         error("Message cannot be empty", "INVALID_INPUT")
 
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -44,7 +43,7 @@ async def send_message(chat_arg: str, message: str, reply_to: int | None = None)
     except Exception as e:
         error(f"Failed to send message: {e}", "SEND_ERROR")
 
-    chat_name = getattr(entity, "title", None) or getattr(entity, "first_name", None) or "Unknown"
+    chat_name = entity_name(entity)
 
     await client.disconnect()
 
@@ -52,7 +51,7 @@ async def send_message(chat_arg: str, message: str, reply_to: int | None = None)
         "success": True,
         "messageId": result.id,
         "chat": chat_name,
-        "date": result.date.isoformat() if result.date else None,
+        "date": result.date,
     })
 
 
@@ -63,7 +62,7 @@ def main():
     parser.add_argument("--reply-to", type=int, help="Message ID to reply to")
     args = parser.parse_args()
 
-    asyncio.run(send_message(args.chat, args.message, args.reply_to))
+    run(send_message(args.chat, args.message, args.reply_to))
 
 
 if __name__ == "__main__":
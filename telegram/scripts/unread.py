@@ -7,17 +7,18 @@ Usage:
 """
 
 import argparse
-import asyncio
+import heapq
 import sys
+from operator import itemgetter
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _client import get_client, output, error, classify_entity
-
-from telethon.errors import FloodWaitError
+from _client import get_client, output, error, classify_entity, call_with_retry, run
 
 
 async def list_unread(limit: int = 20, min_unread: int = 1):
+    from telethon.errors import FloodWaitError
+
     client = get_client()
 
     try:
@@ -26,45 +27,43 @@ async def list_unread(limit: int = 20, min_unread: int = 1):
         error(f"Failed to connect: {e}", "CONNECTION_ERROR")
 
     try:
-        dialogs = await client.get_dialogs(limit=500)
+        dialogs = await call_with_retry(lambda: client.get_dialogs(limit=500))
     except FloodWaitError as e:
         error(f"Rate limited. Retry in {e.seconds}s", "FLOOD_WAIT")
     except Exception as e:
         error(f"Failed to get dialogs: {e}", "API_ERROR")
 
-    # Filter to unread and sort by count
-    unread_chats = []
-    total_unread = 0
+    # Rank lightweight (mentions, unread, dialog) tuples first, and only build
+    # the full chat dicts for the top `limit`
+    candidates = [
+        (d.unread_mentions_count or 0, d.unread_count, d)
+        for d in dialogs if d.unread_count >= min_unread
+    ]
+    total_unread = sum(c[1] for c in candidates)
 
-    for d in dialogs:
-        if d.unread_count < min_unread:
-            continue
+    # Sort by unread count descending, mentions first
+    top = heapq.nlargest(limit, candidates, key=itemgetter(0, 1))
 
-        total_unread += d.unread_count
+    unread_chats = []
+    for mention_count, unread_count, d in top:
         entity = d.entity
 
         last_msg = None
         if d.message:
             last_msg = {
-                "date": d.message.date.isoformat() if d.message.date else None,
+                "date": d.message.date,
                 "text": (d.message.text or "")[:200] if d.message.text else None,
             }
 
-        chat = {
+        unread_chats.append({
             "id": str(entity.id),
             "name": d.name or "Unknown",
             "type": classify_entity(entity),
-            "unreadCount": d.unread_count,
-            "mentionCount": d.unread_mentions_count,
+            "unreadCount": unread_count,
+            "mentionCount": mention_count,
             "lastMessage": last_msg,
             "username": getattr(entity, "username", None),
-        }
-
-        unread_chats.append(chat)
-
-    # Sort by unread count descending, mentions first
-    unread_chats.sort(key=lambda c: (c["mentionCount"] or 0, c["unreadCount"]), reverse=True)
-    unread_chats = unread_chats[:limit]
+        })
 
     await client.disconnect()
 
@@ -81,7 +80,7 @@ def main():
     parser.add_argument("--min-unread", type=int, default=1, help="Min unread count (default: 1)")
     args = parser.parse_args()
 
-    asyncio.run(list_unread(args.limit, args.min_unread))
+    run(list_unread(args.limit, args.min_unread))
 
 
 if __name__ == "__main__":
@@ -5,10 +5,11 @@ Uses mock objects that mimic Telethon's types without needing a real connection.
 Run: cd telegram && uv run --group dev pytest tests/ -v
 """
 
+import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import patch
 from types import SimpleNamespace
 
 import pytest
@@ -16,12 +17,24 @@ import pytest
 # Add scripts dir to path so we can import _client
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
+import _client
 from _client import (
+    call_with_retry,
+    run,
+    telegram_client,
     classify_entity,
+    error,
+    output,
+    output_items,
+    entity_name,
     format_sender,
     format_message,
+    format_messages,
+    full_name,
     parse_date,
     parse_date_end_of_day,
+    resolve_chat,
+    resolve_from_user,
 )
 
 
@@ -30,38 +43,31 @@ from _client import (
 # =============================================================================
 
 # We need the real types for isinstance checks in classify_entity/format_sender
-from telethon.tl.types import User, Chat, Channel
+from telethon.errors import FloodWaitError
+from telethon.tl.types import (
+    User, Chat, Channel, ChatPhotoEmpty, InputPeerUser,
+    MessageMediaDocument, MessageMediaPhoto, MessageMediaWebPage, WebPageEmpty,
+)
+
+# Media carries no state format_message reads beyond its type, so share one of each
+PHOTO_MEDIA = MessageMediaPhoto()
+WEBPAGE_MEDIA = MessageMediaWebPage(webpage=WebPageEmpty(id=0))
 
 
 def make_user(id=123, first_name="Alice", last_name="Smith", username="alice", bot=False):
-    """Create a minimal User-like object."""
-    u = MagicMock(spec=User)
-    u.id = id
-    u.first_name = first_name
-    u.last_name = last_name
-    u.username = username
-    u.bot = bot
-    # Make isinstance work
-    u.__class__ = User
-    return u
+    """Create a minimal real User (isinstance checks need the Telethon type)."""
+    return User(id=id, first_name=first_name, last_name=last_name, username=username, bot=bot)
 
 
 def make_channel(id=456, title="Test Channel", username="testchannel", broadcast=True):
-    c = MagicMock(spec=Channel)
-    c.id = id
-    c.title = title
-    c.username = username
-    c.broadcast = broadcast
-    c.__class__ = Channel
-    return c
+    return Channel(
+        id=id, title=title, photo=ChatPhotoEmpty(), date=None,
+        username=username, broadcast=broadcast,
+    )
 
 
 def make_chat(id=789, title="Test Group"):
-    c = MagicMock(spec=Chat)
-    c.id = id
-    c.title = title
-    c.__class__ = Chat
-    return c
+    return Chat(id=id, title=title, photo=ChatPhotoEmpty(), participants_count=0, date=None, version=0)
 
 
 def make_message(
@@ -78,20 +84,20 @@ def make_message(
     edit_date=None,
     chat=None,
 ):
-    msg = MagicMock()
-    msg.id = id
-    msg.date = date or datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
-    msg.sender = sender
-    msg.text = text
-    msg.reply_to = reply_to
-    msg.forward = forward
-    msg.media = media
-    msg.views = views
-    msg.reactions = reactions
-    msg.pinned = pinned
-    msg.edit_date = edit_date
-    msg.chat = chat
-    return msg
+    return SimpleNamespace(
+        id=id,
+        date=date or datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc),
+        sender=sender,
+        text=text,
+        reply_to=reply_to,
+        forward=forward,
+        media=media,
+        views=views,
+        reactions=reactions,
+        pinned=pinned,
+        edit_date=edit_date,
+        chat=chat,
+    )
 
 
 # =============================================================================
@@ -196,9 +202,7 @@ class TestFormatMessage:
         assert result["isPinned"] is True
 
     def test_reply_to(self):
-        reply = MagicMock()
-        reply.reply_to_msg_id = 99
-        msg = make_message(reply_to=reply)
+        msg = make_message(reply_to=SimpleNamespace(reply_to_msg_id=99))
         result = format_message(msg)
         assert result["replyTo"] == "99"
 
@@ -220,39 +224,58 @@ class TestFormatMessage:
         assert result["date"] == "2026-02-10T12:00:00+00:00"
 
     def test_photo_media(self):
-        from telethon.tl.types import MessageMediaPhoto
-        media = MagicMock(spec=MessageMediaPhoto)
-        media.__class__ = MessageMediaPhoto
-        msg = make_message(media=media)
+        msg = make_message(media=PHOTO_MEDIA)
         result = format_message(msg)
         assert result["mediaType"] == "photo"
 
     def test_webpage_media(self):
-        from telethon.tl.types import MessageMediaWebPage
-        media = MagicMock(spec=MessageMediaWebPage)
-        media.__class__ = MessageMediaWebPage
-        msg = make_message(media=media)
+        msg = make_message(media=WEBPAGE_MEDIA)
         result = format_message(msg)
         assert result["mediaType"] == "webpage"
 
+    def _document_media(self, *attributes):
+        return MessageMediaDocument(document=SimpleNamespace(attributes=list(attributes)))
+
+    def test_video_document(self):
+        from telethon.tl.types import DocumentAttributeFilename, DocumentAttributeVideo
+        media = self._document_media(
+            DocumentAttributeFilename(file_name="clip.mp4"),
+            DocumentAttributeVideo(duration=3, w=640, h=480),
+        )
+        assert format_message(make_message(media=media))["mediaType"] == "video"
+
+    def test_voice_and_audio_documents(self):
+        from telethon.tl.types import DocumentAttributeAudio
+        voice = self._document_media(DocumentAttributeAudio(duration=3, voice=True))
+        audio = self._document_media(DocumentAttributeAudio(duration=3))
+        assert format_message(make_message(media=voice))["mediaType"] == "voice"
+        assert format_message(make_message(media=audio))["mediaType"] == "audio"
+
+    def test_sticker_document(self):
+        from telethon.tl.types import DocumentAttributeSticker, InputStickerSetEmpty
+        media = self._document_media(DocumentAttributeSticker(alt="", stickerset=InputStickerSetEmpty()))
+        assert format_message(make_message(media=media))["mediaType"] == "sticker"
+
+    def test_plain_document(self):
+        from telethon.tl.types import DocumentAttributeFilename
+        media = self._document_media(DocumentAttributeFilename(file_name="deck.pdf"))
+        assert format_message(make_message(media=media))["mediaType"] == "document"
+
+    def test_document_without_document(self):
+        media = self._document_media()
+        media.document = None
+        assert format_message(make_message(media=media))["mediaType"] is None
+
     def test_no_media(self):
         msg = make_message(media=None)
         result = format_message(msg)
         assert result["mediaType"] is None
 
     def test_reactions(self):
-        reaction1 = MagicMock()
-        reaction1.reaction = MagicMock()
-        reaction1.reaction.emoticon = "👍"
-        reaction1.count = 5
-
-        reaction2 = MagicMock()
-        reaction2.reaction = MagicMock()
-        reaction2.reaction.emoticon = "❤️"
-        reaction2.count = 3
-
-        reactions = MagicMock()
-        reactions.results = [reaction1, reaction2]
+        reactions = SimpleNamespace(results=[
+            SimpleNamespace(reaction=SimpleNamespace(emoticon="👍"), count=5),
+            SimpleNamespace(reaction=SimpleNamespace(emoticon="❤️"), count=3),
+        ])
 
         msg = make_message(reactions=reactions)
         result = format_message(msg)
@@ -267,23 +290,98 @@ class TestFormatMessage:
         assert result["reactions"] is None
 
     def test_forward_from_chat(self):
-        fwd = MagicMock()
-        fwd.chat = MagicMock()
-        fwd.chat.title = "News Channel"
+        fwd = SimpleNamespace(chat=SimpleNamespace(title="News Channel"))
         msg = make_message(forward=fwd)
         result = format_message(msg)
         assert result["forwardFrom"] == "News Channel"
 
     def test_forward_from_sender(self):
-        fwd = MagicMock()
-        fwd.chat = None  # no chat attribute
-        fwd.sender = make_user(id=5, first_name="Bob", last_name=None)
-        # hasattr(fwd, 'chat') is True but fwd.chat is falsy
+        # fwd.chat is present but falsy
+        fwd = SimpleNamespace(chat=None, sender=make_user(id=5, first_name="Bob", last_name=None))
         msg = make_message(forward=fwd)
         result = format_message(msg)
         # Should fall through to format_sender path
         assert result["forwardFrom"]["name"] == "Bob"
 
+    def test_forward_hidden_sender(self):
+        fwd = SimpleNamespace(chat=None, sender=None)
+        result = format_message(make_message(forward=fwd))
+        assert result["forwardFrom"]["name"] == "Unknown"
+
+    def test_forward_without_chat_or_sender(self):
+        result = format_message(make_message(forward=SimpleNamespace()))
+        assert result["forwardFrom"] is None
+
+
+class TestFormatMessages:
+    def test_preserves_order(self):
+        msgs = [make_message(id=3), make_message(id=1), make_message(id=2)]
+        assert [m["id"] for m in format_messages(msgs)] == ["3", "1", "2"]
+
+    def test_accepts_iterator(self):
+        msgs = [make_message(id=1), make_message(id=2)]
+        assert [m["id"] for m in format_messages(reversed(msgs))] == ["2", "1"]
+
+    def test_empty(self):
+        assert format_messages([]) == []
+
+    def test_sender_formatted_once_per_batch(self):
+        alice = make_user(id=1, first_name="Alice", last_name=None)
+        bob = make_user(id=2, first_name="Bob", last_name=None)
+        msgs = [make_message(id=i, sender=s) for i, s in enumerate([alice, bob, alice, None])]
+        result = format_messages(msgs)
+        assert [m["sender"]["name"] for m in result] == ["Alice", "Bob", "Alice", "Unknown"]
+        assert result[0]["sender"] is result[2]["sender"]
+
+    def test_same_id_different_type_not_shared(self):
+        user = make_user(id=5, first_name="Alice", last_name=None)
+        channel = make_channel(id=5, title="News")
+        result = format_messages([make_message(sender=user), make_message(sender=channel)])
+        assert result[0]["sender"]["name"] == "Alice"
+        assert result[1]["sender"]["name"] == "News"
+
+    def test_forward_sender_shares_cache(self):
+        alice = make_user(id=1, first_name="Alice", last_name=None)
+        fwd = SimpleNamespace(chat=None, sender=alice)
+        result = format_messages([make_message(id=1, sender=alice), make_message(id=2, forward=fwd)])
+        assert result[1]["forwardFrom"] is result[0]["sender"]
+
+
+
+# =============================================================================
+# full_name
+# =============================================================================
+
+
+class TestFullName:
+    @pytest.mark.parametrize("first, last, expected", [
+        ("Alice", "Smith", "Alice Smith"),
+        ("Alice", None, "Alice"),
+        ("Alice", "", "Alice"),
+        (None, "Smith", "Smith"),
+        (None, None, ""),
+        ("", "", ""),
+    ])
+    def test_matches_join_of_non_empty_parts(self, first, last, expected):
+        assert full_name(first, last) == expected
+
+
+# =============================================================================
+# entity_name
+# =============================================================================
+
+
+class TestEntityName:
+    def test_channel_title(self):
+        channel = Channel(id=1, title="Deal Flow", photo=ChatPhotoEmpty(), date=None)
+        assert entity_name(channel) == "Deal Flow"
+
+    def test_user_first_name(self):
+        assert entity_name(User(id=7, first_name="Alice", last_name="Smith")) == "Alice"
+
+    def test_unknown(self):
+        assert entity_name(User(id=7)) == "Unknown"
+
 
 # =============================================================================
 # parse_date / parse_date_end_of_day
@@ -305,6 +403,19 @@ class TestParseDates:
         assert result.hour == 0
         assert result.tzinfo == timezone.utc
 
+    def test_iso_with_offset_keeps_it(self):
+        result = parse_date("2026-02-10T15:30:00+02:00")
+        assert result == datetime(2026, 2, 10, 13, 30, tzinfo=timezone.utc)
+
+    def test_unpadded_date(self):
+        assert parse_date("2026-2-1") == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    def test_invalid_date(self):
+        with pytest.raises(ValueError):
+            parse_date("2026-13-01")
+        with pytest.raises(ValueError):
+            parse_date("yesterday")
+
     def test_end_of_day_date_only(self):
         result = parse_date_end_of_day("2026-02-10")
         assert result.year == 2026
@@ -317,3 +428,354 @@ class TestParseDates:
         result = parse_date_end_of_day("2026-02-10T08:00:00")
         assert result.hour == 8
         assert result.tzinfo == timezone.utc
+
+
+# =============================================================================
+# resolve_chat (fuzzy dialog matching)
+# =============================================================================
+
+
+def make_dialog(name, username=None):
+    entity = SimpleNamespace(id=hash(name), username=username)
+    return SimpleNamespace(name=name, entity=entity)
+
+
+class FakeDialogClient:
+    """Client whose direct lookups all fail, forcing the dialog scan."""
+
+    def __init__(self, dialogs):
+        self.dialogs = dialogs
+
+    async def get_entity(self, _):
+        raise ValueError("not found")
+
+    async def iter_dialogs(self, limit=None):
+        for d in self.dialogs[:limit]:
+            yield d
+
+
+@pytest.fixture
+def tmp_resolve_cache(tmp_path):
+    """Keep resolve_chat's name cache out of the real config dir."""
+    import _resolve_cache
+    with patch.object(_resolve_cache, "RESOLVE_CACHE_PATH", tmp_path / "resolve_cache.json"):
+        yield
+
+
+@pytest.mark.usefixtures("tmp_resolve_cache")
+class TestResolveChatFuzzy:
+    @pytest.mark.asyncio
+    async def test_exact_beats_earlier_prefix(self):
+        dialogs = [make_dialog("Founders Club"), make_dialog("Founders")]
+        result = await resolve_chat(FakeDialogClient(dialogs), "founders")
+        assert result is dialogs[1].entity
+
+    @pytest.mark.asyncio
+    async def test_exact_username(self):
+        dialogs = [make_dialog("Alpha Team"), make_dialog("Beta", username="alpha")]
+        result = await resolve_chat(FakeDialogClient(dialogs), "alpha")
+        assert result is dialogs[1].entity
+
+    @pytest.mark.asyncio
+    async def test_prefix_beats_earlier_contains(self):
+        dialogs = [make_dialog("The Deal Flow"), make_dialog("Deal Room")]
+        result = await resolve_chat(FakeDialogClient(dialogs), "deal")
+        assert result is dialogs[1].entity
+
+    @pytest.mark.asyncio
+    async def test_first_match_wins_within_rank(self):
+        dialogs = [make_dialog(None), make_dialog("My Deals"), make_dialog("Old Deals")]
+        result = await resolve_chat(FakeDialogClient(dialogs), "deals")
+        assert result is dialogs[1].entity
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_hit_is_cached(self):
+        class CountingClient(FakeDialogClient):
+            dialog_fetches = 0
+
+            async def get_entity(self, arg):
+                if isinstance(arg, InputPeerUser):
+                    return self.dialogs[0].entity
+                raise ValueError("not found")
+
+            async def iter_dialogs(self, limit=None):
+                self.dialog_fetches += 1
+                for d in self.dialogs:
+                    yield d
+
+        alice = User(id=7, access_hash=77, first_name="Alice")
+        client = CountingClient([SimpleNamespace(name="Alice Smith", entity=alice)])
+        assert await resolve_chat(client, "alice") is alice
+        assert await resolve_chat(client, "alice") is alice
+        assert client.dialog_fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_scan_seeds_other_dialog_names(self):
+        import _resolve_cache
+
+        alice = User(id=7, access_hash=77, first_name="Alice")
+        bob = User(id=8, access_hash=88, first_name="Bob")
+        dialogs = [
+            SimpleNamespace(name="Alice Smith", entity=alice),
+            SimpleNamespace(name="Bob Jones", entity=bob),
+            SimpleNamespace(name="bobby", entity=bob),
+        ]
+        await resolve_chat(FakeDialogClient(dialogs), "alice")
+        assert _resolve_cache.get_cached_peer("bob jones").user_id == 8
+        # Username-shaped names stay with the @username lookup
+        assert _resolve_cache.get_cached_peer("bobby") is None
+
+    @pytest.mark.asyncio
+    async def test_no_match(self):
+        dialogs = [make_dialog("Alpha"), make_dialog("Beta")]
+        assert await resolve_chat(FakeDialogClient(dialogs), "gamma") is None
+
+
+@pytest.mark.usefixtures("tmp_resolve_cache")
+class TestResolveChatNumeric:
+    @pytest.mark.asyncio
+    async def test_channel_prefix_fallback(self):
+        client = LookupClient({-1001234: "CHANNEL"})
+        assert await resolve_chat(client, "1234") == "CHANNEL"
+        assert client.lookups == [1234, -1234, -1001234]
+
+    @pytest.mark.asyncio
+    async def test_names_skip_numeric_lookup(self):
+        client = LookupClient({"@alice": "ALICE"})
+        assert await resolve_chat(client, "alice") == "ALICE"
+        assert client.lookups == ["@alice"]
+
+
+# =============================================================================
+# run
+# =============================================================================
+
+
+class TestRun:
+    def test_returns_coroutine_result(self):
+        async def work():
+            await _client.asyncio.sleep(0)
+            return 42
+
+        assert run(work()) == 42
+
+    def test_falls_back_without_uvloop(self):
+        async def work():
+            return "ok"
+
+        with patch.dict(sys.modules, {"uvloop": None}):
+            assert run(work()) == "ok"
+
+
+# =============================================================================
+# telegram_client
+# =============================================================================
+
+
+class FakeConnClient:
+    def __init__(self, fail_connect=False):
+        self.fail_connect = fail_connect
+        self.disconnected = False
+
+    async def connect(self):
+        if self.fail_connect:
+            raise OSError("network down")
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class TestTelegramClient:
+    @pytest.mark.asyncio
+    async def test_disconnects_after_block(self):
+        client = FakeConnClient()
+        async with telegram_client(client) as c:
+            assert c is client
+            assert not client.disconnected
+        assert client.disconnected
+
+    @pytest.mark.asyncio
+    async def test_disconnects_when_block_exits(self, capsys):
+        client = FakeConnClient()
+        with pytest.raises(SystemExit):
+            async with telegram_client(client):
+                error("Chat not found", "CHAT_NOT_FOUND")
+        assert client.disconnected
+        assert json.loads(capsys.readouterr().out)["code"] == "CHAT_NOT_FOUND"
+
+    @pytest.mark.asyncio
+    async def test_connect_failure(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            async with telegram_client(FakeConnClient(fail_connect=True)):
+                pass
+        assert exc.value.code == 1
+        assert json.loads(capsys.readouterr().out) == {
+            "error": "Failed to connect: network down",
+            "code": "CONNECTION_ERROR",
+        }
+
+
+# =============================================================================
+# call_with_retry
+# =============================================================================
+
+
+class Flaky:
+    """Factory that raises the given errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+        async def attempt():
+            if self.errors:
+                raise self.errors.pop(0)
+            return "ok"
+
+        return attempt()
+
+
+@pytest.fixture
+def sleeps():
+    """Record asyncio.sleep durations instead of sleeping."""
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    with patch.object(_client.asyncio, "sleep", fake_sleep):
+        yield slept
+
+
+class TestCallWithRetry:
+    @pytest.mark.asyncio
+    async def test_success_first_try(self, sleeps):
+        factory = Flaky()
+        assert await call_with_retry(factory) == "ok"
+        assert factory.calls == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_flood_wait_sleeps_server_duration(self, sleeps):
+        factory = Flaky(FloodWaitError(request=None, capture=5))
+        assert await call_with_retry(factory) == "ok"
+        assert sleeps == [6]
+
+    @pytest.mark.asyncio
+    async def test_long_flood_wait_reraised(self, sleeps):
+        factory = Flaky(FloodWaitError(request=None, capture=300))
+        with pytest.raises(FloodWaitError):
+            await call_with_retry(factory, max_wait=60)
+        assert factory.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_back_off(self, sleeps):
+        factory = Flaky(ConnectionError(), TimeoutError())
+        assert await call_with_retry(factory) == "ok"
+        assert sleeps == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, sleeps):
+        factory = Flaky(*[ConnectionError()] * 4)
+        with pytest.raises(ConnectionError):
+            await call_with_retry(factory, max_retries=3)
+        assert factory.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_other_errors_not_retried(self, sleeps):
+        factory = Flaky(ValueError("bad peer"))
+        with pytest.raises(ValueError):
+            await call_with_retry(factory)
+        assert factory.calls == 1
+
+
+# =============================================================================
+# resolve_from_user
+# =============================================================================
+
+
+class LookupClient:
+    def __init__(self, known):
+        self.known = known
+        self.lookups = []
+
+    async def get_entity(self, arg):
+        self.lookups.append(arg)
+        if arg in self.known:
+            return self.known[arg]
+        raise ValueError("not found")
+
+
+@pytest.mark.usefixtures("tmp_resolve_cache")
+class TestResolveFromUser:
+    @pytest.mark.asyncio
+    async def test_username_gets_at_prefix(self):
+        client = LookupClient({"@alice": "ALICE"})
+        assert await resolve_from_user(client, "alice") == "ALICE"
+        assert client.lookups == ["@alice"]
+
+    @pytest.mark.asyncio
+    async def test_numeric_id_fallback(self):
+        client = LookupClient({42: "USER42"})
+        assert await resolve_from_user(client, "42") == "USER42"
+        assert client.lookups == ["@42", 42]
+
+    @pytest.mark.asyncio
+    async def test_not_found(self):
+        assert await resolve_from_user(LookupClient({}), "ghost") is None
+
+    @pytest.mark.asyncio
+    async def test_username_hit_is_cached(self):
+        alice = User(id=7, access_hash=77, first_name="Alice")
+        client = LookupClient({"@alice": alice})
+        assert await resolve_from_user(client, "alice") is alice
+        peer = await resolve_from_user(client, "@Alice")
+        assert (peer.user_id, peer.access_hash) == (7, 77)
+        assert client.lookups == ["@alice"]
+
+
+# =============================================================================
+# output / error
+# =============================================================================
+
+
+class TestOutput:
+    def test_output_single_json_line(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            output({"name": "Café", "date": datetime(2026, 2, 10, tzinfo=timezone.utc), 1: "x"})
+        assert exc.value.code == 0
+        out = capsys.readouterr().out
+        assert out.count("\n") == 1
+        assert json.loads(out) == {"name": "Café", "date": "2026-02-10T00:00:00+00:00", "1": "x"}
+
+    def test_output_falls_back_to_str(self, capsys):
+        with pytest.raises(SystemExit):
+            output({"path": Path("/tmp/x.jsonl")})
+        assert json.loads(capsys.readouterr().out) == {"path": "/tmp/x.jsonl"}
+
+    def test_output_items(self, capsys):
+        items = ({"id": str(i)} for i in range(3))
+        with pytest.raises(SystemExit) as exc:
+            output_items("chats", items, {"note": "ok"})
+        assert exc.value.code == 0
+        out = capsys.readouterr().out
+        assert out.count("\n") == 1
+        assert json.loads(out) == {
+            "chats": [{"id": "0"}, {"id": "1"}, {"id": "2"}],
+            "count": 3,
+            "note": "ok",
+        }
+
+    def test_output_items_empty(self, capsys):
+        with pytest.raises(SystemExit):
+            output_items("chats", [])
+        assert json.loads(capsys.readouterr().out) == {"chats": [], "count": 0}
+
+    def test_error(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            error("Boom", "API_ERROR")
+        assert exc.value.code == 1
+        assert json.loads(capsys.readouterr().out) == {"error": "Boom", "code": "API_ERROR"}
@@ -0,0 +1,116 @@
+"""
+Tests for create_group.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_create_group.py -v
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from create_group import load_contact_index, lookup_contact, resolve_user
+
+from telethon.tl.functions.contacts import GetContactsRequest
+from telethon.tl.types import User
+
+
+class ContactsClient:
+    """Client whose GetContactsRequest returns a fixed contact list."""
+
+    def __init__(self, users):
+        self.users = users
+        self.requests = []
+        self.lookups = []
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        if isinstance(request, GetContactsRequest):
+            return SimpleNamespace(users=self.users)
+        raise ValueError("unexpected request")
+
+    async def get_entity(self, arg):
+        self.lookups.append(arg)
+        if arg == "@carol":
+            return CAROL
+        if arg == "@alice":
+            return GLOBAL_ALICE
+        raise ValueError("not found")
+
+
+ALICE = User(id=7, first_name="Alice", last_name="Smith", username="alice_s")
+BOB = User(id=8, first_name="Bob", last_name=None, username=None)
+CAROL = User(id=9, first_name="Carol", last_name=None, username="carol")
+# A contact named "Alice" without a username, and the global @alice
+NAMED_ALICE = User(id=11, first_name="Alice", last_name=None, username=None)
+GLOBAL_ALICE = User(id=12, first_name="Someone", last_name=None, username="alice")
+
+
+# =============================================================================
+# load_contact_index
+# =============================================================================
+
+
+class TestLoadContactIndex:
+    @pytest.mark.asyncio
+    async def test_indexes_id_username_and_name(self):
+        index = await load_contact_index(ContactsClient([ALICE, BOB]))
+        assert index == {
+            "ids": {"7": ALICE, "8": BOB},
+            "usernames": {"alice_s": ALICE},
+            "names": {"alice smith": ALICE, "bob": BOB},
+        }
+
+    @pytest.mark.asyncio
+    async def test_request_failure_gives_empty_index(self):
+        class FailingClient:
+            async def __call__(self, request):
+                raise ConnectionError("offline")
+
+        assert await load_contact_index(FailingClient()) == {}
+
+    @pytest.mark.asyncio
+    async def test_username_beats_later_name(self):
+        # A later contact's name must not shadow an earlier contact's username
+        named = User(id=10, first_name="alice_s", last_name=None, username=None)
+        index = await load_contact_index(ContactsClient([ALICE, named]))
+        assert lookup_contact(index, "alice_s") is ALICE
+
+
+# =============================================================================
+# resolve_user
+# =============================================================================
+
+
+class TestResolveUser:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("user_arg", ["7", "@alice_s", "alice_s", "Alice Smith"])
+    async def test_contact_hit_skips_network(self, user_arg):
+        client = ContactsClient([ALICE, BOB])
+        contacts = await load_contact_index(client)
+        assert await resolve_user(client, user_arg, contacts) is ALICE
+        assert client.lookups == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_falls_back_to_get_entity(self):
+        client = ContactsClient([ALICE, BOB])
+        contacts = await load_contact_index(client)
+        assert await resolve_user(client, "carol", contacts) is CAROL
+        assert client.lookups == ["@carol"]
+
+    @pytest.mark.asyncio
+    async def test_at_username_ignores_contact_names(self):
+        client = ContactsClient([NAMED_ALICE])
+        contacts = await load_contact_index(client)
+        assert await resolve_user(client, "@alice", contacts) is GLOBAL_ALICE
+        assert client.lookups == ["@alice"]
+
+    @pytest.mark.asyncio
+    async def test_bare_arg_falls_back_to_contact_name(self):
+        client = ContactsClient([NAMED_ALICE])
+        contacts = await load_contact_index(client)
+        assert await resolve_user(client, "alice", contacts) is NAMED_ALICE
+        assert client.lookups == []
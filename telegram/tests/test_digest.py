@@ -0,0 +1,225 @@
+"""
+Tests for digest.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_digest.py -v
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import _client
+import _watermarks
+import digest
+
+from telethon.errors import FloodWaitError
+from telethon.tl.types import Chat, ChatPhotoEmpty, User
+
+
+def make_dialog(id, name, username=None, unread_count=0, group=False):
+    if group:
+        entity = Chat(id=id, title=name, photo=ChatPhotoEmpty(), participants_count=3, date=None, version=1)
+    else:
+        entity = User(id=id, first_name=name, username=username)
+    return SimpleNamespace(entity=entity, name=name, unread_count=unread_count)
+
+
+def make_msg(id):
+    return SimpleNamespace(
+        id=id, date=datetime(2026, 1, 1, tzinfo=timezone.utc), sender=None,
+        text="x", reply_to=None, forward=None, media=None, views=None,
+        reactions=None, pinned=False, edit_date=None,
+    )
+
+
+DIALOGS = [
+    make_dialog(1, "Team Alpha"),
+    make_dialog(2, "Team"),
+    make_dialog(3, "Founders"),
+    make_dialog(4, "bob chat", username="bobby"),
+]
+
+
+class DigestClient:
+    """
+    Client with a fixed dialog list; iter_dialogs can fail once mid-scan.
+    Each chat has `counts[id]` messages (default 1), IDs id*100+1 and up.
+    """
+
+    def __init__(self, dialogs, fail_once=None, counts=None):
+        self.dialogs = dialogs
+        self.fail_once = fail_once
+        self.counts = counts or {}
+        self.scans = 0
+        self.fetches = []
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def iter_dialogs(self, limit=None):
+        self.scans += 1
+        for i, d in enumerate(self.dialogs):
+            if i == 1 and self.fail_once:
+                error, self.fail_once = self.fail_once, None
+                raise error
+            yield d
+
+    async def get_dialogs(self, limit=None):
+        return self.dialogs
+
+    async def get_messages(self, entity, limit=None, min_id=None):
+        self.fetches.append((entity.id, limit))
+        count = self.counts.get(entity.id, 1)
+        # Newest first, like Telegram
+        ids = range(entity.id * 100 + count, entity.id * 100, -1)
+        return [make_msg(i) for i in ids if i > (min_id or 0)][:limit]
+
+
+@pytest.fixture
+def watermarks_path(tmp_path):
+    path = tmp_path / "watermarks.json"
+    with patch.object(_watermarks, "WATERMARKS_PATH", path):
+        yield path
+
+
+@pytest.fixture
+def run(watermarks_path, capsys):
+    """Run a digest against a fake client and return its JSON output."""
+
+    async def run(client, *args, **kwargs):
+        with patch.object(digest, "get_client", lambda: client), pytest.raises(SystemExit):
+            await digest.run_digest(*args, **kwargs)
+        return json.loads(capsys.readouterr().out)
+
+    return run
+
+
+@pytest.fixture
+def run_filtered(run):
+    """Run a dry-run digest with --chats filters and return the selected chat names."""
+
+    async def run_filtered(client, filters):
+        result = await run(client, filters, dry_run=True)
+        return sorted(c["chat"]["name"] for c in result["chats"])
+
+    return run_filtered
+
+
+def saved_watermarks(path):
+    if not path.exists():
+        return {}
+    return {k: v["lastMessageId"] for k, v in json.loads(path.read_text()).items()}
+
+
+class TestChatFilter:
+    @pytest.mark.asyncio
+    async def test_exact_title_keeps_other_substring_matches(self, run_filtered):
+        assert await run_filtered(DigestClient(DIALOGS), ["team"]) == ["Team", "Team Alpha"]
+
+    @pytest.mark.asyncio
+    async def test_username_match(self, run_filtered):
+        names = await run_filtered(DigestClient(DIALOGS), ["@bobby", "founders"])
+        assert names == ["Founders", "bob chat"]
+
+    @pytest.mark.asyncio
+    async def test_flood_wait_retries_scan(self, run_filtered):
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        client = DigestClient(DIALOGS, fail_once=FloodWaitError(request=None, capture=2))
+        with patch.object(_client.asyncio, "sleep", fake_sleep):
+            names = await run_filtered(client, ["team"])
+        assert names == ["Team", "Team Alpha"]
+        assert client.scans == 2
+        assert slept == [3]
+
+
+# =============================================================================
+# Windowed fetch and maxTotal budget
+# =============================================================================
+
+
+class TestBudget:
+    @pytest.mark.asyncio
+    async def test_max_total_exceeded_mid_window(self, run, watermarks_path):
+        dialogs = [make_dialog(i, f"dm{i}", unread_count=3) for i in (1, 2, 3)]
+        client = DigestClient(dialogs, counts={1: 3, 2: 3, 3: 3})
+        result = await run(client, max_total=5, concurrency=5)
+        # One window: every fetch is capped at the budget left before it
+        assert client.fetches == [(1, 5), (2, 5), (3, 5)]
+        assert [(c["chat"]["name"], c["newCount"]) for c in result["chats"]] == [("dm1", 3), ("dm2", 2)]
+        # The newest messages are the ones kept
+        assert [m["id"] for m in result["chats"][1]["messages"]] == ["202", "203"]
+        assert result["totalNewMessages"] == 5
+        assert result["skippedChats"] == ["dm3"]
+        assert saved_watermarks(watermarks_path) == {"1": 103, "2": 203}
+
+    @pytest.mark.asyncio
+    async def test_chats_past_budget_skipped_without_fetch(self, run, watermarks_path):
+        dialogs = [make_dialog(i, f"dm{i}", unread_count=3) for i in (1, 2, 3)]
+        client = DigestClient(dialogs, counts={1: 3, 2: 3, 3: 3})
+        result = await run(client, max_total=3, concurrency=1)
+        assert client.fetches == [(1, 3)]
+        assert result["skippedChats"] == ["dm2", "dm3"]
+        assert saved_watermarks(watermarks_path) == {"1": 103}
+
+    @pytest.mark.asyncio
+    async def test_results_in_priority_order(self, run):
+        dialogs = [
+            make_dialog(1, "group a", unread_count=1, group=True),
+            make_dialog(2, "dm", unread_count=1),
+            make_dialog(3, "group b", unread_count=1, group=True),
+        ]
+        result = await run(DigestClient(dialogs), concurrency=2, dry_run=True)
+        assert [c["chat"]["name"] for c in result["chats"]] == ["dm", "group a", "group b"]
+
+
+# =============================================================================
+# --summary-only
+# =============================================================================
+
+
+class TestSummaryOnly:
+    @pytest.fixture
+    def client(self):
+        # limit 2 x BACKLOG_FACTOR 5 = 10, so 11 unread is a backlog
+        dialogs = [make_dialog(1, "backlog", unread_count=11), make_dialog(2, "dm", unread_count=2)]
+        return DigestClient(dialogs, counts={1: 11, 2: 2})
+
+    @pytest.mark.asyncio
+    async def test_backlog_chat_summarised(self, run, client, watermarks_path):
+        result = await run(client, limit_per_chat=2, summary_only=True)
+        backlog, dm = result["chats"]
+        assert backlog["skipped"] is True
+        assert backlog["unreadCount"] == 11
+        assert backlog["messages"] == []
+        assert dm["newCount"] == 2
+        # Only the newest message ID is fetched for the backlog chat
+        assert client.fetches == [(1, 1), (2, 2)]
+        assert result["totalNewMessages"] == 2
+        assert saved_watermarks(watermarks_path) == {"1": 111, "2": 202}
+
+    @pytest.mark.asyncio
+    async def test_dry_run_leaves_watermark(self, run, client, watermarks_path):
+        result = await run(client, limit_per_chat=2, summary_only=True, dry_run=True)
+        assert result["chats"][0]["skipped"] is True
+        assert not watermarks_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_watermarked_chat_not_summarised(self, run, client, watermarks_path):
+        _watermarks.set_watermark("1", 100)
+        result = await run(client, limit_per_chat=2, summary_only=True, dry_run=True)
+        assert "skipped" not in result["chats"][0]
+        assert result["chats"][0]["newCount"] == 2
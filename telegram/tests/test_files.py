@@ -0,0 +1,74 @@
+"""
+Tests for _files.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_files.py -v
+"""
+
+import json
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from _files import file_lock, write_json_atomic
+
+
+class TestWriteJsonAtomic:
+    def test_writes_json(self, tmp_path):
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {"a": 1, "name": "Café"})
+        assert json.loads(path.read_text()) == {"a": 1, "name": "Café"}
+
+    def test_creates_parent_dirs(self, tmp_path):
+        path = tmp_path / "a" / "b" / "state.json"
+        write_json_atomic(path, {})
+        assert path.exists()
+
+    def test_private_mode(self, tmp_path):
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {})
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_no_temp_file_left(self, tmp_path):
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {"a": 1})
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        path = tmp_path / "state.json"
+        write_json_atomic(path, {"v": 1})
+        with patch("_files.orjson.dumps", side_effect=TypeError("boom")):
+            with pytest.raises(TypeError):
+                write_json_atomic(path, {"v": 2})
+        assert json.loads(path.read_text()) == {"v": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_concurrent_writers_never_corrupt(self, tmp_path):
+        path = tmp_path / "state.json"
+        payloads = [{"writer": i, "pad": "x" * 50000 * (i + 1)} for i in range(4)]
+
+        def write_many(data):
+            for _ in range(20):
+                write_json_atomic(path, data)
+
+        with ThreadPoolExecutor(len(payloads)) as pool:
+            list(pool.map(write_many, payloads))
+        assert json.loads(path.read_text()) in payloads
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+class TestFileLock:
+    def test_lock_is_exclusive(self, tmp_path):
+        fcntl = pytest.importorskip("fcntl")
+        path = tmp_path / "data.json"
+        with file_lock(path):
+            with open(tmp_path / "data.json.lock") as other:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with open(tmp_path / "data.json.lock") as other:
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -0,0 +1,127 @@
+"""
+Tests for history.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_history.py -v
+"""
+
+import asyncio
+import errno
+import io
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import history
+from history import export_history, make_line_encoder, write_chunks
+
+
+class TestMakeLineEncoder:
+    def test_appends_chat_fields(self):
+        encode = make_line_encoder("123", "Test Chat")
+        line = encode({"id": "1", "text": "hello"})
+        assert line.endswith(b"\n")
+        assert json.loads(line) == {
+            "id": "1",
+            "text": "hello",
+            "chatId": "123",
+            "chatName": "Test Chat",
+        }
+
+    def test_escapes_chat_name(self):
+        encode = make_line_encoder("1", 'Quote "this" \\ é')
+        assert json.loads(encode({"id": "1"}))["chatName"] == 'Quote "this" \\ é'
+
+    def test_datetime_values(self):
+        encode = make_line_encoder("1", "Chat")
+        when = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert json.loads(encode({"id": "1", "date": when}))["date"] == "2026-01-01T00:00:00+00:00"
+
+
+class TestWriteChunks:
+    @pytest.mark.asyncio
+    async def test_writes_in_order_until_sentinel(self):
+        out = io.BytesIO()
+        queue = asyncio.Queue()
+        for chunk in (b"a\n", b"b\n", None, b"ignored"):
+            queue.put_nowait(chunk)
+        await write_chunks(queue, out)
+        assert out.getvalue() == b"a\nb\n"
+
+
+# =============================================================================
+# export_history
+# =============================================================================
+
+
+def make_msg(id, text="hi"):
+    return SimpleNamespace(
+        id=id, date=datetime(2026, 1, 1, tzinfo=timezone.utc), sender=None, text=text,
+        reply_to=None, forward=None, media=None, views=None, reactions=None,
+        pinned=False, edit_date=None, chat=None,
+    )
+
+
+class ExportClient:
+    """Client that yields the given messages, then raises `fail` if set."""
+
+    def __init__(self, messages, fail=None):
+        self.messages = messages
+        self.fail = fail
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def iter_messages(self, entity, limit=None):
+        for m in self.messages:
+            yield m
+        if self.fail:
+            raise self.fail
+
+
+@pytest.fixture
+def export_env():
+    """Patch export_history's client and chat lookup; flush every line as its own chunk."""
+    entity = SimpleNamespace(id=1, title="Chat")
+
+    async def resolve(client, chat_arg):
+        return entity
+
+    def use(client):
+        return patch.multiple(
+            history,
+            get_client=lambda: client,
+            resolve_chat=resolve,
+            WRITE_CHUNK_SIZE=1,
+        )
+
+    return use
+
+
+class TestExportHistory:
+    @pytest.mark.asyncio
+    async def test_error_mid_export_flushes_fetched_lines(self, export_env, tmp_path):
+        out = tmp_path / "export.jsonl"
+        client = ExportClient([make_msg(1), make_msg(2)], fail=RuntimeError("boom"))
+        with export_env(client), pytest.raises(RuntimeError, match="boom"):
+            await export_history("chat", str(out))
+        lines = out.read_bytes().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not Path("/dev/full").exists(), reason="needs /dev/full")
+    async def test_write_failure_raises_instead_of_hanging(self, export_env):
+        # Lines larger than the file buffer go straight to the (always full) device
+        client = ExportClient([make_msg(i, "x" * 20000) for i in range(20)])
+        with export_env(client), pytest.raises(OSError) as exc:
+            await asyncio.wait_for(export_history("chat", "/dev/full"), timeout=5)
+        assert exc.value.errno == errno.ENOSPC
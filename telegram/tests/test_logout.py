@@ -0,0 +1,73 @@
+"""
+Tests for logout.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_logout.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import logout
+
+
+class RevokeClient:
+    """Client whose log_out can hang and whose disconnect raises or hangs."""
+
+    def __init__(self, disconnect_error=None, disconnect_hangs=False, log_out_hangs=False):
+        self.disconnect_error = disconnect_error
+        self.disconnect_hangs = disconnect_hangs
+        self.log_out_hangs = log_out_hangs
+
+    async def connect(self):
+        pass
+
+    async def log_out(self):
+        if self.log_out_hangs:
+            await asyncio.Event().wait()
+
+    async def disconnect(self):
+        if self.disconnect_hangs:
+            await asyncio.Event().wait()
+        if self.disconnect_error:
+            raise self.disconnect_error
+
+
+@pytest.fixture
+def session_file(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text("{}")
+    return path
+
+
+class Output(Exception):
+    """Raised in place of output()'s sys.exit, which can't cross wait_for's task."""
+
+
+def fake_output(data):
+    raise Output(data)
+
+
+class TestRevoke:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("client", [
+        RevokeClient(disconnect_error=ConnectionError("reset")),
+        RevokeClient(disconnect_hangs=True),
+        # The revoke times out, then the disconnect in its cleanup hangs too
+        RevokeClient(log_out_hangs=True, disconnect_hangs=True),
+    ], ids=["disconnect_raises", "disconnect_hangs", "log_out_and_disconnect_hang"])
+    async def test_session_removed_when_disconnect_fails(self, session_file, client):
+        with patch.object(logout, "SESSION_PATH", session_file), \
+                patch.object(logout, "get_client", lambda: client), \
+                patch.object(logout, "output", fake_output), \
+                patch.object(logout, "REVOKE_TIMEOUT", 0.1), \
+                patch.object(logout, "DISCONNECT_TIMEOUT", 0.1), \
+                pytest.raises(Output) as exc:
+            await asyncio.wait_for(logout.do_logout(revoke=True), timeout=5)
+        assert exc.value.args[0] == {"success": True, "revoked": True}
+        assert not session_file.exists()
@@ -0,0 +1,87 @@
+"""
+Tests for _resolve_cache.py
+
+Run: cd telegram && uv run --group dev pytest tests/test_resolve_cache.py -v
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import _resolve_cache as rc
+from telethon.tl.types import User, Chat, Channel, InputPeerUser, InputPeerChat, InputPeerChannel
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path):
+    """Redirect the resolve cache to a temp file for each test."""
+    fake_path = tmp_path / "resolve_cache.json"
+    with patch.object(rc, "RESOLVE_CACHE_PATH", fake_path):
+        yield fake_path
+
+
+class TestLoadSave:
+    def test_load_empty(self):
+        assert rc.load_resolve_cache() == {}
+
+    def test_load_corrupt_file(self, tmp_cache):
+        tmp_cache.write_text("not json{{{")
+        assert rc.load_resolve_cache() == {}
+
+
+class TestCachePeer:
+    def test_user_round_trip(self):
+        rc.cache_peer("Alice", User(id=1, access_hash=111))
+        peer = rc.get_cached_peer("alice")
+        assert isinstance(peer, InputPeerUser)
+        assert (peer.user_id, peer.access_hash) == (1, 111)
+
+    def test_channel_round_trip(self):
+        rc.cache_peer("News", Channel(id=2, title="News", photo=None, date=None, access_hash=222))
+        peer = rc.get_cached_peer("NEWS")
+        assert isinstance(peer, InputPeerChannel)
+        assert (peer.channel_id, peer.access_hash) == (2, 222)
+
+    def test_chat_round_trip(self):
+        rc.cache_peer("Team", Chat(id=3, title="Team", photo=None, participants_count=2, date=None, version=1))
+        peer = rc.get_cached_peer("team")
+        assert isinstance(peer, InputPeerChat)
+        assert peer.chat_id == 3
+
+    def test_unknown_entity_not_cached(self, tmp_cache):
+        rc.cache_peer("x", object())
+        assert not tmp_cache.exists()
+
+    def test_cache_peers_first_wins(self):
+        rc.cache_peers([
+            ("Team Chat", User(id=1, access_hash=111)),
+            ("team chat", User(id=2, access_hash=222)),
+            ("Other", User(id=3, access_hash=333)),
+        ])
+        assert rc.get_cached_peer("team chat").user_id == 1
+        assert rc.get_cached_peer("other").user_id == 3
+
+    def test_miss(self):
+        assert rc.get_cached_peer("nobody") is None
+
+    def test_expired(self, tmp_cache):
+        stale = datetime.now(timezone.utc) - rc.RESOLVE_CACHE_TTL - timedelta(minutes=1)
+        tmp_cache.write_text(json.dumps({
+            "alice": {"peerType": "user", "id": 1, "accessHash": 111, "cachedAt": stale.isoformat()},
+        }))
+        assert rc.get_cached_peer("alice") is None
+
+    def test_malformed_entry(self, tmp_cache):
+        tmp_cache.write_text(json.dumps({"alice": {"peerType": "user"}}))
+        assert rc.get_cached_peer("alice") is None
+
+    def test_forget(self):
+        rc.cache_peer("Alice", User(id=1, access_hash=111))
+        rc.forget_peer("ALICE")
+        assert rc.get_cached_peer("alice") is None
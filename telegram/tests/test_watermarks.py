@@ -25,18 +25,21 @@ def tmp_watermarks(tmp_path):
 
 
 class TestLoadSave:
-    def test_load_empty(self, tmp_watermarks):
-        assert wm.load_watermarks() == {}
+    @pytest.mark.parametrize("contents, expected", [
+        (None, {}),
+        ("not json{{{", {}),
+        ('{"123": {"lastMessageId": 456}}', {"123": {"lastMessageId": 456}}),
+    ], ids=["missing", "corrupt", "valid"])
+    def test_load(self, tmp_watermarks, contents, expected):
+        if contents is not None:
+            tmp_watermarks.write_text(contents)
+        assert wm.load_watermarks() == expected
 
     def test_save_and_load(self, tmp_watermarks):
         data = {"123": {"lastMessageId": 456, "lastRunAt": "2026-02-10T12:00:00"}}
         wm.save_watermarks(data)
         assert wm.load_watermarks() == data
 
-    def test_load_corrupt_file(self, tmp_watermarks):
-        tmp_watermarks.write_text("not json{{{")
-        assert wm.load_watermarks() == {}
-
     def test_creates_parent_dirs(self, tmp_path):
         deep_path = tmp_path / "a" / "b" / "c" / "watermarks.json"
         with patch.object(wm, "WATERMARKS_PATH", deep_path):
@@ -82,21 +85,15 @@ class TestBatch:
         assert wm.get_watermark("222") == 200
         assert wm.get_watermark("333") == 300
 
-    def test_batch_preserves_existing(self):
-        wm.set_watermark("111", 50, "Old")
-        wm.set_watermarks_batch([
-            {"chatId": "222", "messageId": 200},
-        ])
+    @pytest.mark.parametrize("update, expected", [
         # Old watermark still there
-        assert wm.get_watermark("111") == 50
-        assert wm.get_watermark("222") == 200
-
-    def test_batch_overwrites_existing(self):
+        ({"chatId": "222", "messageId": 200}, {"111": 50, "222": 200}),
+        ({"chatId": "111", "messageId": 999, "chatName": "New"}, {"111": 999}),
+    ], ids=["preserves_existing", "overwrites_existing"])
+    def test_batch_over_existing(self, update, expected):
         wm.set_watermark("111", 50, "Old")
-        wm.set_watermarks_batch([
-            {"chatId": "111", "messageId": 999, "chatName": "New"},
-        ])
-        assert wm.get_watermark("111") == 999
+        wm.set_watermarks_batch([update])
+        assert {chat_id: wm.get_watermark(chat_id) for chat_id in expected} == expected
 
 
 class TestClear:
@@ -109,3 +106,61 @@ class TestClear:
     def test_clear_nonexistent(self, tmp_watermarks):
         # Should not raise
         wm.clear_watermarks()
+
+
+class TestCache:
+    def test_load_reads_file_once(self, tmp_watermarks):
+        wm.save_watermarks({"1": {"lastMessageId": 1}})
+        with patch.object(wm, "_read_watermarks") as read:
+            wm.get_watermark("1")
+            wm.get_watermark("2")
+            read.assert_not_called()
+
+    def test_mutating_loaded_dict_leaves_cache(self, tmp_watermarks):
+        wm.set_watermark("1", 1)
+        wm.load_watermarks()["2"] = {"lastMessageId": 2}
+        assert wm.get_watermark("2") is None
+        assert wm.load_watermarks().keys() == {"1"}
+
+    def test_mutating_saved_dict_leaves_cache(self, tmp_watermarks):
+        data = {"1": {"lastMessageId": 1}}
+        wm.save_watermarks(data)
+        data["2"] = {"lastMessageId": 2}
+        assert wm.get_watermark("2") is None
+        assert wm.load_watermarks().keys() == {"1"}
+
+    def test_mutating_loaded_entry_leaves_cache(self, tmp_watermarks):
+        wm.set_watermark("1", 1)
+        wm.load_watermarks()["1"]["lastMessageId"] = 99
+        assert wm.get_watermark("1") == 1
+
+    def test_mutating_saved_entry_leaves_cache(self, tmp_watermarks):
+        data = {"1": {"lastMessageId": 1}}
+        wm.save_watermarks(data)
+        data["1"]["lastMessageId"] = 99
+        assert wm.get_watermark("1") == 1
+
+    def test_batch_merges_concurrent_writes(self, tmp_watermarks):
+        wm.load_watermarks()
+        # Another run updates a different chat after this one loaded
+        tmp_watermarks.write_text('{"9": {"lastMessageId": 9}}')
+        wm.set_watermarks_batch([{"chatId": "1", "messageId": 1}])
+        assert wm.get_watermark("9") == 9
+        assert wm.get_watermark("1") == 1
+        assert json.loads(tmp_watermarks.read_text()).keys() == {"1", "9"}
+
+    def test_external_write_reloads(self, tmp_watermarks):
+        wm.set_watermark("1", 1)
+        # Another run replaces the file after this one cached it
+        tmp_watermarks.with_name("other.json").write_text('{"9": {"lastMessageId": 9}}')
+        tmp_watermarks.with_name("other.json").replace(tmp_watermarks)
+        assert wm.get_watermark("9") == 9
+        assert wm.get_watermark("1") is None
+
+    def test_path_change_reloads(self, tmp_path):
+        other = tmp_path / "other.json"
+        other.write_text('{"9": {"lastMessageId": 9}}')
+        wm.set_watermark("1", 1)
+        with patch.object(wm, "WATERMARKS_PATH", other):
+            assert wm.get_watermark("9") == 9
+            assert wm.get_watermark("1") is None